@@ -14,7 +14,13 @@ from urllib.parse import urlparse, urlencode
 from curl_cffi import requests as curl_requests
 from camoufox.async_api import AsyncCamoufox
 from utils.config import AccountConfig, ProviderConfig
-from utils.browser_utils import parse_cookies, get_random_user_agent, take_screenshot, aliyun_captcha_check
+from utils.browser_utils import (
+    parse_cookies,
+    get_random_user_agent,
+    take_screenshot,
+    aliyun_captcha_check,
+    sanitize_filename,
+)
 from utils.get_cf_clearance import get_cf_clearance
 from utils.http_utils import proxy_resolve, response_resolve
 from utils.topup import topup
@@ -30,21 +36,26 @@ class CheckIn:
         provider_config: ProviderConfig,
         global_proxy: dict | None = None,
         storage_state_dir: str = "storage-states",
+        account_index: int | None = None,
     ):
         """初始化签到管理器
 
         Args:
                 account_info: account 用户配置
                 proxy_config: 全局代理配置(可选)
+                account_index: 账号在 ACCOUNTS 中的索引(可选)，用于区分同名账号
         """
         self.account_name = account_name
-        self.safe_account_name = "".join(c if c.isalnum() else "_" for c in account_name)
+        self.safe_account_name = sanitize_filename(account_name)
         self.account_config = account_config
         self.provider_config = provider_config
 
         # 将全局代理存入 account_config.extra，供 get_cdk 和 check_in_status 等函数使用
         if global_proxy:
             self.account_config.extra["global_proxy"] = global_proxy
+        # 账号索引同样存入 extra，供 get_cdk 区分账号（如按账号缓存 cf_clearance）
+        if account_index is not None:
+            self.account_config.extra["account_index"] = account_index
 
         # 代理优先级: 账号配置 > 全局配置
         self.camoufox_proxy_config = account_config.proxy if account_config.proxy else global_proxy
@@ -357,9 +368,11 @@ class CheckIn:
                     # 从 localStorage 获取 status
                     status_data = None
                     try:
-                        status_str = await page.evaluate("() => localStorage.getItem('status')")
-                        if status_str:
-                            status_data = json.loads(status_str)
+                        # 在页面内解析 JSON，直接返回对象
+                        status_data = await page.evaluate(
+                            "() => { const v = localStorage.getItem('status'); return v ? JSON.parse(v) : null; }"
+                        )
+                        if status_data:
                             print(f"✅ {self.account_name}: Got status from localStorage")
                         else:
                             print(f"⚠️ {self.account_name}: No status found in localStorage")
@@ -830,6 +843,7 @@ class CheckIn:
         cookies: dict,
         api_user: str | int,
         topup_interval: int = 60,
+        session: curl_requests.Session | None = None,
     ) -> dict:
         """执行完整的 CDK 获取和充值流程
 
@@ -843,6 +857,7 @@ class CheckIn:
             cookies: cookies 字典
             api_user: API 用户 ID（通过参数传递，因为登录方式可能不同）
             topup_interval: 多次 topup 之间的间隔时间（秒），默认 60 秒
+            session: 复用的 curl_cffi Session（可选），多次 topup 共用同一连接
 
         Returns:
             包含 success, topup_count, errors 等信息的字典
@@ -921,6 +936,7 @@ class CheckIn:
                 headers=topup_headers,
                 cookies=cookies,
                 key=cdk,
+                session=session,
             )
 
             results["topup_count"] += 1
@@ -964,7 +980,7 @@ class CheckIn:
         cookies: dict,
         common_headers: dict,
         api_user: str | int,
-        impersonate: str = "firefox135",
+        impersonate: str | None = None,
     ) -> tuple[bool, dict]:
         """使用已有 cookies 执行签到操作
         
@@ -972,11 +988,17 @@ class CheckIn:
             cookies: cookies 字典
             common_headers: 公用请求头（包含 User-Agent 和可能的 Client Hints）
             api_user: API 用户 ID
+            impersonate: curl_cffi 浏览器指纹模拟，默认根据 User-Agent 推断
         """
         print(
             f"ℹ️ {self.account_name}: Executing check-in with existing cookies (using proxy: {'true' if self.http_proxy_config else 'false'})"
         )
 
+        # TLS 指纹需与 User-Agent 保持一致，签到、topup、用户信息共用此 session，
+        # 签到状态查询同样按请求头中的 User-Agent 推断，整个流程使用同一个指纹
+        if not impersonate:
+            impersonate = get_curl_cffi_impersonate(common_headers.get("User-Agent", ""))
+
         session = curl_requests.Session(impersonate=impersonate, proxy=self.http_proxy_config, timeout=30)
         
         try:
@@ -997,7 +1019,9 @@ class CheckIn:
                 # 如果配置了签到状态查询，先检查是否已签到
                 check_in_status_func = self.provider_config.get_check_in_status_func()
                 if check_in_status_func:
-                    checked_in_today = check_in_status_func(
+                    # 状态查询函数为同步阻塞调用，放到线程中执行，避免阻塞其他并行账号
+                    checked_in_today = await asyncio.to_thread(
+                        check_in_status_func,
                         provider_config=self.provider_config,
                         account_config=self.account_config,
                         cookies=cookies,
@@ -1011,7 +1035,8 @@ class CheckIn:
                         if not check_in_result.get("success"):
                             return False, {"error": check_in_result.get("error", "Check-in failed")}
                         # 签到成功后再次查询状态（显示最新状态）
-                        check_in_status_func(
+                        await asyncio.to_thread(
+                            check_in_status_func,
                             provider_config=self.provider_config,
                             account_config=self.account_config,
                             cookies=cookies,
@@ -1028,7 +1053,7 @@ class CheckIn:
             # 如果需要手动 topup（配置了 topup_path 和 get_cdk），执行 topup
             if self.provider_config.needs_manual_topup():
                 print(f"ℹ️ {self.account_name}: Provider requires manual topup, executing...")
-                topup_result = await self.execute_topup(headers, cookies, api_user)
+                topup_result = await self.execute_topup(headers, cookies, api_user, session=session)
                 if topup_result.get("topup_count", 0) > 0:
                     print(
                         f"ℹ️ {self.account_name}: Topup completed - "
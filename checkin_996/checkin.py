@@ -10,6 +10,7 @@ from curl_cffi import requests as curl_requests
 
 # Add parent directory to Python path to find utils module
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.browser_utils import sanitize_filename
 from utils.http_utils import proxy_resolve, response_resolve
 
 
@@ -28,7 +29,7 @@ class CheckIn:
             global_proxy: 全局代理配置(可选)
         """
         self.account_name = account_name
-        self.safe_account_name = "".join(c if c.isalnum() else "_" for c in account_name)
+        self.safe_account_name = sanitize_filename(account_name)
         self.global_proxy = global_proxy
         self.http_proxy_config = proxy_resolve(global_proxy)
 
@@ -112,30 +112,25 @@ class LinuxDoReadPosts:
             await page.fill("#login-account-password", self.password)
             await page.wait_for_timeout(2000)
 
-            # 点击登录按钮
+            # 点击登录按钮，等待跳转离开登录页（包括 Cloudflare 验证完成），最多等待60秒
             await page.click("#login-button")
-            await page.wait_for_timeout(10000)
+            try:
+                await page.wait_for_url(
+                    lambda url: not url.startswith("https://linux.do/login") and "linux.do/challenge" not in url,
+                    timeout=60000,
+                )
+            except Exception:
+                print(f"⚠️ {self.username}: Timeout waiting for navigation after login")
 
             await save_page_content_to_file(page, "login_result", self.username)
 
-            # 检查是否遇到 Cloudflare 验证
             current_url = page.url
             print(f"ℹ️ {self.username}: URL after login: {current_url}")
 
             if "linux.do/challenge" in current_url:
-                print(
-                    f"⚠️ {self.username}: Cloudflare challenge detected, "
-                    "Camoufox should bypass it automatically. Waiting..."
-                )
-                # 等待 Cloudflare 验证完成，最多等待60秒
-                try:
-                    await page.wait_for_url("https://linux.do/", timeout=60000)
-                    print(f"✅ {self.username}: Cloudflare challenge bypassed")
-                except Exception:
-                    print(f"⚠️ {self.username}: Cloudflare challenge timeout")
+                print(f"⚠️ {self.username}: Cloudflare challenge not bypassed within timeout")
 
-            # 再次检查是否登录成功
-            current_url = page.url
+            # 检查是否登录成功
             if current_url.startswith("https://linux.do/login"):
                 print(f"❌ {self.username}: Login failed, still on login page")
                 await take_screenshot(page, "login_failed", self.username)
@@ -224,7 +219,11 @@ class LinuxDoReadPosts:
         last_topic_id = 0
         browse_start = asyncio.get_event_loop().time()
 
-        for topic in topic_list:
+        # 一次性预生成每篇帖子的等待时长，避免循环内逐个调用 random.randint
+        open_delays = random.choices(range(2000, 3001), k=len(topic_list))
+        read_delays = random.choices(range(1000, 2001), k=len(topic_list))
+
+        for i, topic in enumerate(topic_list):
             if read_count >= max_posts:
                 break
 
@@ -239,9 +238,8 @@ class LinuxDoReadPosts:
             topic_url = f"https://linux.do/t/topic/{topic_id}"
 
             try:
-                print(f"ℹ️ {self.username}: Opening topic {topic_id} ({topic.get('title', '')[:30]})...")
                 await page.goto(topic_url, wait_until="domcontentloaded")
-                await page.wait_for_timeout(random.randint(2000, 3000))
+                await page.wait_for_timeout(open_delays[i])
 
                 # 检查帖子是否有效
                 timeline_element = await page.query_selector(".timeline-replies")
@@ -249,8 +247,12 @@ class LinuxDoReadPosts:
                     print(f"⚠️ {self.username}: Topic {topic_id} invalid, skipping")
                     continue
 
+                # 打开帖子和阅读进度合并为一行输出，减少每篇帖子的日志量
                 inner_text = await timeline_element.inner_text()
-                print(f"✅ {self.username}: Topic {topic_id} - Progress: {inner_text.strip()}")
+                print(
+                    f"✅ {self.username}: Topic {topic_id} ({topic.get('title', '')[:30]}) - "
+                    f"Progress: {inner_text.strip()}"
+                )
 
                 # 滚动浏览，限时 MAX_SCROLL_TIME 秒
                 await self._scroll_to_read(page)
@@ -259,7 +261,7 @@ class LinuxDoReadPosts:
                 last_topic_id = topic_id
 
                 # 模拟阅读间隔
-                await page.wait_for_timeout(random.randint(1000, 2000))
+                await page.wait_for_timeout(read_delays[i])
 
                 if read_count % 20 == 0:
                     print(f"ℹ️ {self.username}: Progress: {read_count}/{max_posts}")
@@ -290,6 +292,7 @@ class LinuxDoReadPosts:
             await page.wait_for_timeout(random.randint(800, 2000))
 
             # 检查是否到底
+            # 每次重新查询进度元素，时间线重新渲染后旧句柄会指向已脱离文档的节点
             timeline_element = await page.query_selector(".timeline-replies")
             if not timeline_element:
                 break
@@ -5,86 +5,146 @@
 
 import asyncio
 import hashlib
-import json
+import re
+import struct
 import sys
+from dataclasses import dataclass
 from datetime import datetime
 from dotenv import load_dotenv
-from utils.config import AppConfig
+from utils.config import AppConfig, AccountConfig
 from utils.notify import notify
 from utils.balance_hash import load_balance_hash, save_balance_hash
-from checkin import CheckIn
 
 load_dotenv(override=True)
 
 BALANCE_HASH_FILE = "balance_hash.txt"
 
+# 代理相关错误关键字
+PROXY_ERROR_PATTERN = re.compile(r"proxy|connection|timeout", re.IGNORECASE)
 
-def generate_balance_hash(balances: dict) -> str:
-    """生成余额数据的hash"""
-    # 将包含 quota 和 used 的结构转换为 {account_name: [quota]} 格式用于 hash 计算
-    simple_balances = {}
-    if balances:
-        for account_key, account_balances in balances.items():
-            quota_list = []
-            for _, balance_info in account_balances.items():
-                quota_list.append(balance_info["quota"])
-            simple_balances[account_key] = quota_list
 
-    balance_json = json.dumps(simple_balances, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256(balance_json.encode("utf-8")).hexdigest()[:16]
+@dataclass(slots=True)
+class BalanceEntry:
+    """单个认证方式的余额信息"""
 
+    quota: float
+    used: float
+    bonus: float
 
-async def main():
-    """运行签到流程
 
-    Returns:
-            退出码: 0 表示至少有一个账号成功, 1 表示全部失败
+def generate_balance_hash(balances: dict) -> str | None:
+    """生成余额数据的hash
+
+    按账号和认证方式排序后，直接将 quota 以二进制写入 BLAKE2b，不经过 JSON 序列化
+    没有余额数据时返回 None
     """
+    if not balances:
+        return None
 
-    print("🚀 newapi.ai multi-account auto check-in script started (using Camoufox)")
-    print(f'🕒 Execution time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
+    h = hashlib.blake2b(digest_size=8)
+    for account_key in sorted(balances):
+        h.update(account_key.encode("utf-8"))
+        h.update(b"\0")
+        account_balances = balances[account_key]
+        for auth_method in sorted(account_balances):
+            # quota 为保留两位小数的 float，按 double 打包以保留小数部分的变化
+            h.update(struct.pack("<d", float(account_balances[auth_method].quota)))
+    return h.hexdigest()
 
-    app_config = AppConfig.load_from_env()
-    print(f"⚙️ Loaded {len(app_config.providers)} provider(s)")
 
-    # 检查账号配置
-    if not app_config.accounts:
-        print("❌ Unable to load account configuration, program exits")
-        return 1
-    
-    print(f"⚙️ Found {len(app_config.accounts)} account(s)")
-
-    # 加载余额hash
-    last_balance_hash = load_balance_hash(BALANCE_HASH_FILE)
+def format_account_report(account_name: str, results: list[tuple[str, bool, dict | None]]) -> str:
+    """生成单个账号的签到结果报告
 
-    # 为每个账号执行签到
-    success_count = 0
-    total_count = 0
-    notification_content = []
-    current_balances = {}
-    need_notify = False  # 是否需要发送通知
+    Args:
+        account_name: 账号名称
+        results: 各认证方式的结果列表 [(auth_method, success, user_info), ...]
 
-    for i, account_config in enumerate(app_config.accounts):
-        account_key = f"account_{i + 1}"
-        account_name = account_config.get_display_name(i)
-        if len(notification_content) > 0:
-            notification_content.append("\n-------------------------------")
+    Returns:
+        账号摘要文本
+    """
+    result_parts = [f"📣 {account_name} 摘要:\n"]
+    success_count_methods = 0
+    for auth_method, success, user_info in results:
+        status = "✅ 成功" if success else "❌ 失败"
+        result_parts.append(f"  {status} - {auth_method} 认证\n")
+
+        if success and user_info and user_info.get("success"):
+            success_count_methods += 1
+            result_parts.append(f"    💰 {user_info['display']}\n")
+        else:
+            error_msg = str((user_info or {}).get("error") or "未知错误")
+            # 检查是否是代理相关错误
+            if PROXY_ERROR_PATTERN.search(error_msg):
+                result_parts.append(f"    🔺 代理连接失败: {error_msg}\n")
+            else:
+                result_parts.append(f"    🔺 {error_msg}\n")
+
+    # 添加统计信息
+    failed_count_methods = len(results) - success_count_methods
+    result_parts.append(f"\n📊 统计: {success_count_methods}/{len(results)} 种方式成功")
+    if failed_count_methods > 0:
+        result_parts.append(f" ({failed_count_methods} 种失败)")
+
+    return "".join(result_parts)
+
+
+async def process_account(
+    i: int,
+    account_config: AccountConfig,
+    app_config: AppConfig,
+    semaphore: asyncio.Semaphore,
+) -> dict:
+    """处理单个账号的签到
+
+    Args:
+        i: 账号索引
+        account_config: 账号配置
+        app_config: 应用配置
+        semaphore: 限制同时处理账号数量的信号量
 
+    Returns:
+        结果字典: account_key, account_name, balances（全部失败时为 None）,
+        auth_results（各认证方式的原始结果，出错时为 None）, notification（出错时的通知文本）,
+        success_count, total_count, need_notify
+    """
+    account_key = f"account_{i + 1}"
+    account_name = account_config.get_display_name(i)
+    result = {
+        "account_key": account_key,
+        "account_name": account_name,
+        "balances": None,
+        "auth_results": None,
+        "notification": "",
+        "success_count": 0,
+        "total_count": 0,
+        "need_notify": False,
+    }
+
+    async with semaphore:
         try:
             provider_config = app_config.get_provider(account_config.provider)
             if not provider_config:
                 print(f"❌ {account_name}: Provider '{account_config.provider}' configuration not found")
-                need_notify = True
-                notification_content.append(
+                result["need_notify"] = True
+                result["notification"] = (
                     f"[FAIL] {account_name}: Provider '{account_config.provider}' configuration not found"
                 )
-                continue
+                return result
+
+            # 延迟导入，未配置账号时无需加载 Camoufox 等浏览器依赖
+            from checkin import CheckIn
 
             print(f"🌀 Processing {account_name} using provider '{account_config.provider}'")
-            checkin = CheckIn(account_name, account_config, provider_config, global_proxy=app_config.global_proxy)
+            checkin = CheckIn(
+                account_name,
+                account_config,
+                provider_config,
+                global_proxy=app_config.global_proxy,
+                account_index=i,
+            )
             results = await checkin.execute()
 
-            total_count += len(results)
+            result["total_count"] = len(results)
 
             # 处理多个认证方式的结果
             account_success = False
@@ -92,65 +152,95 @@ async def main():
             failed_methods = []
 
             this_account_balances = {}
-            # 构建详细的结果报告
-            account_result = f"📣 {account_name} 摘要:\n"
             for auth_method, success, user_info in results:
-                status = "✅ 成功" if success else "❌ 失败"
-                account_result += f"  {status} - {auth_method} 认证\n"
-
                 if success and user_info and user_info.get("success"):
                     account_success = True
-                    success_count += 1
+                    result["success_count"] += 1
                     successful_methods.append(auth_method)
-                    account_result += f"    💰 {user_info['display']}\n"
                     # 记录余额信息
-                    current_quota = user_info["quota"]
-                    current_used = user_info["used_quota"]
-                    current_bonus = user_info["bonus_quota"]
-                    this_account_balances[f"{auth_method}"] = {
-                        "quota": current_quota,
-                        "used": current_used,
-                        "bonus": current_bonus,
-                    }
+                    this_account_balances[auth_method] = BalanceEntry(
+                        quota=user_info["quota"],
+                        used=user_info["used_quota"],
+                        bonus=user_info["bonus_quota"],
+                    )
                 else:
                     failed_methods.append(auth_method)
-                    error_msg = user_info.get("error", "未知错误") if user_info else "未知错误"
-                    # 检查是否是代理相关错误
-                    if "proxy" in str(error_msg).lower() or "connection" in str(error_msg).lower() or "timeout" in str(error_msg).lower():
-                        account_result += f"    🔺 代理连接失败: {str(error_msg)}\n"
-                    else:
-                        account_result += f"    🔺 {str(error_msg)}\n"
 
             if account_success:
-                current_balances[account_key] = this_account_balances
+                result["balances"] = this_account_balances
 
             # 如果所有认证方式都失败，需要通知
             if not account_success and results:
-                need_notify = True
+                result["need_notify"] = True
                 print(f"🔔 {account_name} 所有认证方式失败，将发送通知")
 
             # 如果有失败的认证方式，也通知
             if failed_methods and successful_methods:
-                need_notify = True
+                result["need_notify"] = True
                 print(f"🔔 {account_name} 部分认证方式失败，将发送通知")
 
-            # 添加统计信息
-            success_count_methods = len(successful_methods)
-            failed_count_methods = len(failed_methods)
-
-            account_result += f"\n📊 统计: {success_count_methods}/{len(results)} 种方式成功"
-            if failed_count_methods > 0:
-                account_result += f" ({failed_count_methods} 种失败)"
-
-            notification_content.append(account_result)
+            # 详细报告只在需要发送通知时才生成
+            result["auth_results"] = results
 
         except Exception as e:
             print(f"❌ {account_name} 处理异常: {e}")
-            need_notify = True  # 异常也需要通知
-            notification_content.append(f"❌ {account_name} 异常: {str(e)[:100]}...")
+            result["need_notify"] = True  # 异常也需要通知
+            result["notification"] = f"❌ {account_name} 异常: {str(e)[:100]}..."
+
+    return result
+
+
+async def main():
+    """运行签到流程
+
+    Returns:
+            退出码: 0 表示至少有一个账号成功, 1 表示全部失败
+    """
+
+    # 执行时间只取一次，日志和通知使用同一个时间戳
+    start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    print("🚀 newapi.ai multi-account auto check-in script started (using Camoufox)")
+    print(f"🕒 Execution time: {start_time}")
+
+    app_config = AppConfig.load_from_env()
+    print(f"⚙️ Loaded {len(app_config.providers)} provider(s)")
+
+    # 检查账号配置
+    if not app_config.accounts:
+        print("❌ Unable to load account configuration, program exits")
+        return 1
+    
+    print(f"⚙️ Found {len(app_config.accounts)} account(s)")
+
+    # 加载余额hash
+    last_balance_hash = load_balance_hash(BALANCE_HASH_FILE)
+
+    # 为每个账号执行签到，最多同时处理 max_parallel 个账号
+    # 使用 TaskGroup，任一任务异常退出（如被中断）时会取消其余任务，及时释放浏览器
+    semaphore = asyncio.Semaphore(app_config.max_parallel)
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(process_account(i, account_config, app_config, semaphore))
+            for i, account_config in enumerate(app_config.accounts)
+        ]
+    account_results = [task.result() for task in tasks]
+
+    # 按账号顺序汇总结果
+    success_count = 0
+    total_count = 0
+    current_balances = {}
+    need_notify = False  # 是否需要发送通知
+
+    for account_result in account_results:
+        success_count += account_result["success_count"]
+        total_count += account_result["total_count"]
+        need_notify = need_notify or account_result["need_notify"]
+        if account_result["balances"]:
+            current_balances[account_result["account_key"]] = account_result["balances"]
 
     # 检查余额变化
-    current_balance_hash = generate_balance_hash(current_balances) if current_balances else None
+    current_balance_hash = generate_balance_hash(current_balances)
     print(f"\n\nℹ️ 当前余额哈希: {current_balance_hash}, 上次余额哈希: {last_balance_hash}")
     if current_balance_hash:
         if last_balance_hash is None:
@@ -168,7 +258,19 @@ async def main():
     if current_balance_hash:
         save_balance_hash(BALANCE_HASH_FILE, current_balance_hash)
 
-    if need_notify and notification_content:
+    if need_notify:
+        # 只有需要发送通知时才生成各账号的详细报告
+        notification_content = []
+        for account_result in account_results:
+            if len(notification_content) > 0:
+                notification_content.append("\n-------------------------------")
+            if account_result["auth_results"] is not None:
+                notification_content.append(
+                    format_account_report(account_result["account_name"], account_result["auth_results"])
+                )
+            else:
+                notification_content.append(account_result["notification"])
+
         # 构建通知内容
         summary = [
             "-------------------------------",
@@ -184,9 +286,9 @@ async def main():
         else:
             summary.append("❌ 所有账号签到失败")
 
-        time_info = f'🕓 执行时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
-
-        notify_content = "\n\n".join([time_info, "\n".join(notification_content), "\n".join(summary)])
+        body = "\n".join(notification_content)
+        tail = "\n".join(summary)
+        notify_content = f"🕓 执行时间: {start_time}\n\n{body}\n\n{tail}"
 
         print(notify_content)
         notify.push_message("签到提醒", notify_content, msg_type="text")
@@ -3,12 +3,12 @@
 使用 GitHub 账号执行登录授权
 """
 
-import json
+import asyncio
 import os
 from urllib.parse import urlparse, parse_qs
 from camoufox.async_api import AsyncCamoufox
 from playwright_captcha import CaptchaType, ClickSolver, FrameworkType
-from utils.browser_utils import filter_cookies, take_screenshot, save_page_content_to_file
+from utils.browser_utils import filter_cookies, take_screenshot, save_page_content_to_file, is_cloudflare_challenge
 from utils.config import ProviderConfig
 from utils.wait_for_secrets import WaitForSecrets
 from utils.get_headers import get_browser_headers, print_browser_headers
@@ -40,6 +40,38 @@ class GitHubSignIn:
         self.password = password
         self.proxy = proxy
 
+    async def _try_authorize(self, page, oauth_url: str, save_reason: str | None = None) -> bool:
+        """访问 GitHub 授权页面并尝试完成授权
+
+        已登录时 GitHub 会直接跳转回应用页面，或显示授权按钮（点击后跳转）
+
+        Args:
+            page: Camoufox 页面对象
+            oauth_url: GitHub OAuth 授权地址
+            save_reason: 保存页面 HTML 的原因描述（可选），为空时不保存
+
+        Returns:
+            是否已登录并完成授权
+        """
+        response = await page.goto(oauth_url, wait_until="domcontentloaded")
+        print(f"ℹ️ {self.account_name}: redirected to app page {response.url if response else 'N/A'}")
+        if save_reason:
+            await save_page_content_to_file(page, save_reason, self.account_name, prefix="github")
+
+        # 已登录时可能直接跳转回应用页面
+        if response and response.url.startswith(self.provider_config.origin):
+            print(f"✅ {self.account_name}: Logged in, proceeding to authorization")
+            return True
+
+        # 检查是否出现授权按钮（表示已登录）
+        authorize_btn = await page.query_selector('button[type="submit"]')
+        if authorize_btn:
+            print(f"✅ {self.account_name}: Logged in, approving authorization")
+            await authorize_btn.click()
+            return True
+
+        return False
+
     async def signin(
         self,
         client_id: str,
@@ -110,30 +142,10 @@ class GitHubSignIn:
                     if os.path.exists(cache_file_path):
                         try:
                             print(f"ℹ️ {self.account_name}: Checking login status at {oauth_url}")
-                            # 直接访问授权页面检查是否已登录
-                            response = await page.goto(oauth_url, wait_until="domcontentloaded")
-                            print(
-                                f"ℹ️ {self.account_name}: redirected to app page {response.url if response else 'N/A'}"
-                            )
-                            await save_page_content_to_file(page, "sign_in_check", self.account_name, prefix="github")
-
-                            # 登录后可能直接跳转回应用页面
-                            if response and response.url.startswith(self.provider_config.origin):
-                                is_logged_in = True
-                                print(
-                                    f"✅ {self.account_name}: Already logged in via cache, proceeding to authorization"
-                                )
-                            else:
-                                # 检查是否出现授权按钮（表示已登录）
-                                authorize_btn = await page.query_selector('button[type="submit"]')
-                                if authorize_btn:
-                                    is_logged_in = True
-                                    print(
-                                        f"✅ {self.account_name}: Already logged in via cache, proceeding to authorization"
-                                    )
-                                    await authorize_btn.click()
-                                else:
-                                    print(f"ℹ️ {self.account_name}: Approve button not found, need to login again")
+                            # 直接访问授权页面检查是否已登录，已登录则直接完成授权
+                            is_logged_in = await self._try_authorize(page, oauth_url, save_reason="sign_in_check")
+                            if not is_logged_in:
+                                print(f"ℹ️ {self.account_name}: Approve button not found, need to login again")
                         except Exception as e:
                             print(f"⚠️ {self.account_name}: Failed to check login status: {e}")
 
@@ -193,7 +205,9 @@ class GitHubSignIn:
                                                 "description": "OTP from authenticator app",
                                             }
                                         }
-                                        secrets = wait_for_secrets.get(
+                                        # 轮询最长数分钟，放到线程中执行，避免阻塞其他账号的事件循环
+                                        secrets = await asyncio.to_thread(
+                                            wait_for_secrets.get,
                                             secret_obj,
                                             timeout=5,
                                             notification={
@@ -257,24 +271,8 @@ class GitHubSignIn:
                         # 登录后访问授权页面
                         try:
                             print(f"ℹ️ {self.account_name}: Navigating to authorization page: {oauth_url}")
-                            response = await page.goto(oauth_url, wait_until="domcontentloaded")
-                            print(
-                                f"ℹ️ {self.account_name}: redirected to app page {response.url if response else 'N/A'}"
-                            )
-
-                            # GitHub 登录后可能直接跳转回应用页面
-                            if response and response.url.startswith(self.provider_config.origin):
-                                print(f"✅ {self.account_name}: logged in, proceeding to authorization")
-                            else:
-                                # 检查是否出现授权按钮（表示已登录）
-                                authorize_btn = await page.query_selector('button[type="submit"]')
-                                if authorize_btn:
-                                    print(
-                                        f"✅ {self.account_name}: Already logged in via cache, proceeding to authorization"
-                                    )
-                                    await authorize_btn.click()
-                                else:
-                                    print(f"ℹ️ {self.account_name}: Approve button not found")
+                            if not await self._try_authorize(page, oauth_url):
+                                print(f"ℹ️ {self.account_name}: Approve button not found")
                         except Exception as e:
                             print(f"❌ {self.account_name}: Error occurred while authorization approve: {e}")
                             await take_screenshot(page, "github_auth_approval_failed", self.account_name)
@@ -292,10 +290,7 @@ class GitHubSignIn:
                         await page.wait_for_timeout(5000)
 
                         # 检查是否在 Cloudflare 验证页面
-                        page_title = await page.title()
-                        page_content = await page.content()
-
-                        if "Just a moment" in page_title or "Checking your browser" in page_content:
+                        if await is_cloudflare_challenge(page):
                             cloudflare_challenge_detected = True
                             print(f"ℹ️ {self.account_name}: Cloudflare challenge detected, auto-solving...")
                             try:
@@ -325,9 +320,11 @@ class GitHubSignIn:
                         except Exception:
                             await page.wait_for_timeout(5000)
 
-                        user_data = await page.evaluate("() => localStorage.getItem('user')")
-                        if user_data:
-                            user_obj = json.loads(user_data)
+                        # 在页面内解析 JSON，直接返回对象
+                        user_obj = await page.evaluate(
+                            "() => { const v = localStorage.getItem('user'); return v ? JSON.parse(v) : null; }"
+                        )
+                        if user_obj:
                             api_user = user_obj.get("id")
                             if api_user:
                                 print(f"✅ {self.account_name}: Got api user: {api_user}")
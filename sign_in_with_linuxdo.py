@@ -3,12 +3,11 @@
 使用 Camoufox 绕过 Cloudflare 验证执行 Linux.do 签到
 """
 
-import json
 import os
 from urllib.parse import urlparse, parse_qs
 from camoufox.async_api import AsyncCamoufox
 from playwright_captcha import CaptchaType, ClickSolver, FrameworkType
-from utils.browser_utils import filter_cookies, take_screenshot, save_page_content_to_file
+from utils.browser_utils import filter_cookies, take_screenshot, save_page_content_to_file, is_cloudflare_challenge
 from utils.config import ProviderConfig
 from utils.get_headers import get_browser_headers, print_browser_headers
 
@@ -150,10 +149,7 @@ class LinuxDoSignIn:
                             await page.goto("https://linux.do/login", wait_until="domcontentloaded")
 
                             # 检查是否在 Cloudflare 验证页面
-                            page_title = await page.title()
-                            page_content = await page.content()
-
-                            if "Just a moment" in page_title or "Checking your browser" in page_content:
+                            if await is_cloudflare_challenge(page):
                                 print(f"ℹ️ {self.account_name}: Cloudflare challenge detected, auto-solving...")
                                 try:
                                     await solver.solve_captcha(
@@ -241,10 +237,7 @@ class LinuxDoSignIn:
                         await page.wait_for_timeout(5000)
 
                         # 检查是否在 Cloudflare 验证页面
-                        page_title = await page.title()
-                        page_content = await page.content()
-
-                        if "Just a moment" in page_title or "Checking your browser" in page_content:
+                        if await is_cloudflare_challenge(page):
                             cloudflare_challenge_detected = True
                             print(f"ℹ️ {self.account_name}: Cloudflare challenge detected, auto-solving...")
                             try:
@@ -274,9 +267,11 @@ class LinuxDoSignIn:
                         except Exception:
                             await page.wait_for_timeout(5000)
 
-                        user_data = await page.evaluate("() => localStorage.getItem('user')")
-                        if user_data:
-                            user_obj = json.loads(user_data)
+                        # 在页面内解析 JSON，直接返回对象
+                        user_obj = await page.evaluate(
+                            "() => { const v = localStorage.getItem('user'); return v ? JSON.parse(v) : null; }"
+                        )
+                        if user_obj:
                             api_user = user_obj.get("id")
                             if api_user:
                                 print(f"✅ {self.account_name}: Got api user: {api_user}")
@@ -13,9 +13,12 @@ def load_balance_hash(balance_hash_file: str) -> str | None:
         balance_hash_file: 余额哈希文件路径
     """
     try:
-        if os.path.exists(balance_hash_file):
-            with open(balance_hash_file, "r", encoding="utf-8") as f:
-                return f.read().strip()
+        # 文件不存在或为空时视为没有历史hash
+        if os.stat(balance_hash_file).st_size == 0:
+            return None
+        # hash 为十六进制字符串，按二进制读取后以 ASCII 解码
+        with open(balance_hash_file, "rb") as f:
+            return f.read().strip().decode("ascii") or None
     except Exception:
         pass
     return None
@@ -23,13 +26,17 @@ def load_balance_hash(balance_hash_file: str) -> str | None:
 
 def save_balance_hash(balance_hash_file: str, balance_hash: str) -> None:
     """保存余额hash
+
+    先写入临时文件再替换，避免进程中断时留下被截断的文件
     
     Args:
         balance_hash_file: 余额哈希文件路径
         balance_hash: 余额哈希值
     """
     try:
-        with open(balance_hash_file, "w", encoding="utf-8") as f:
-            f.write(balance_hash)
+        tmp_file = f"{balance_hash_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(balance_hash.encode("ascii"))
+        os.replace(tmp_file, balance_hash_file)
     except Exception as e:
         print(f"Warning: Failed to save balance hash: {e}")
\ No newline at end of file
@@ -3,16 +3,85 @@
 浏览器自动化相关的公共工具函数
 """
 
+import asyncio
 import os
 import random
+import re
+from collections.abc import Mapping
 from datetime import datetime
-from urllib.parse import urlparse
+from functools import lru_cache
+
+# 文件名中需要替换为 "_" 的字符（非字母数字，包括 "_" 本身）
+UNSAFE_FILENAME_CHARS = re.compile(r"[\W_]")
+
+# 现代浏览器 User Agent 列表
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 " "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:134.0) " "Gecko/20100101 Firefox/134.0",
+)
+
+# 已创建的输出目录，避免每次截图/保存都调用 os.makedirs
+created_dirs: set[str] = set()
+
+
+def ensure_dir(path: str) -> None:
+    """确保目录存在，同一目录只创建一次
+
+    Args:
+        path: 目录路径
+    """
+    if path not in created_dirs:
+        os.makedirs(path, exist_ok=True)
+        created_dirs.add(path)
+
+
+def is_debug() -> bool:
+    """是否开启调试输出（环境变量 DEBUG 为 1/true/yes 时开启）
+
+    调用时读取环境变量，保证 load_dotenv 之后的配置也能生效
+
+    Returns:
+        是否开启调试输出
+    """
+    return os.getenv("DEBUG", "").strip().lower() in ("1", "true", "yes")
+
+
+def write_text_file(filepath: str, content: str) -> None:
+    """以 UTF-8 编码写入文本文件
+
+    以二进制模式写入，跳过文本模式的换行符转换；无法编码的字符（如孤立的代理对）替换为 "?"
+
+    Args:
+        filepath: 文件路径
+        content: 文件内容
+    """
+    with open(filepath, "wb") as f:
+        f.write(content.encode("utf-8", "replace"))
+
+
+@lru_cache(maxsize=256)
+def sanitize_filename(name: str) -> str:
+    """将字符串中的非字母数字字符替换为 "_"，用于生成安全的文件名
+
+    Args:
+        name: 原始字符串
+
+    Returns:
+        安全的文件名片段
+    """
+    return UNSAFE_FILENAME_CHARS.sub("_", name)
 
 
 def parse_cookies(cookies_data) -> dict:
     """解析 cookies 数据
 
-    支持字典格式和字符串格式的 cookies
+    支持字典（及其他 Mapping）格式和字符串格式的 cookies
 
     Args:
         cookies_data: cookies 数据，可以是字典或分号分隔的字符串
@@ -23,16 +92,53 @@ def parse_cookies(cookies_data) -> dict:
     if isinstance(cookies_data, dict):
         return cookies_data
 
+    if isinstance(cookies_data, Mapping):
+        return dict(cookies_data)
+
     if isinstance(cookies_data, str):
+        if not cookies_data:
+            return {}
         cookies_dict = {}
         for cookie in cookies_data.split(";"):
-            if "=" in cookie:
-                key, value = cookie.strip().split("=", 1)
+            key, sep, value = cookie.strip().partition("=")
+            if sep:
                 cookies_dict[key] = value
         return cookies_dict
     return {}
 
 
+def get_origin_host(origin: str) -> str:
+    """从 origin URL 中提取主机名（不含用户信息和端口）
+
+    只做字符串查找和切片，不构造完整的 urlparse 结果
+
+    Args:
+        origin: origin URL (例如: https://api.example.com:8443)
+
+    Returns:
+        主机名 (例如: api.example.com)
+    """
+    start = origin.find("://")
+    start = 0 if start < 0 else start + 3
+    end = len(origin)
+    for sep in "/?#":
+        pos = origin.find(sep, start, end)
+        if pos >= 0:
+            end = pos
+    host = origin[start:end]
+
+    # 去掉用户信息 user:pass@
+    at = host.rfind("@")
+    if at >= 0:
+        host = host[at + 1 :]
+
+    # 去掉端口，IPv6 地址形如 [::1]:8080
+    colon = host.rfind(":")
+    if colon >= 0 and host.rfind("]") < colon:
+        host = host[:colon]
+    return host
+
+
 def filter_cookies(cookies: list[dict], origin: str) -> dict:
     """根据 origin 过滤 cookies，只保留匹配域名的 cookies
 
@@ -44,33 +150,47 @@ def filter_cookies(cookies: list[dict], origin: str) -> dict:
         过滤后的 cookies 字典 {name: value}
     """
     # 提取 provider origin 的域名
-    provider_domain = urlparse(origin).netloc
+    provider_domain = get_origin_host(origin)
+    # cookie domain 可能以 . 开头 (如 .example.com)，需要处理；provider 侧只需计算一次
+    normalized_provider_domain = provider_domain.lstrip(".")
+    provider_domain_suffix = "." + normalized_provider_domain
 
     # 过滤 cookies，只保留与 provider domain 匹配的
     user_cookies = {}
+    matched_count = 0
+    filtered_count = 0
+    # 逐个 cookie 的明细只在调试模式下生成和输出
+    debug = is_debug()
     matched_items = []  # 存储 "name(domain)" 格式
     filtered_items = []  # 存储 "name(domain)" 格式
 
     for cookie in cookies:
         cookie_name = cookie.get("name")
         cookie_value = cookie.get("value")
-        cookie_domain = cookie.get("domain", "")
+        if not cookie_name or not cookie_value:
+            continue
 
-        if cookie_name and cookie_value:
-            # 检查 cookie domain 是否匹配 provider domain
-            # cookie domain 可能以 . 开头 (如 .example.com)，需要处理
-            normalized_cookie_domain = cookie_domain.lstrip(".")
-            normalized_provider_domain = provider_domain.lstrip(".")
-
-            # 匹配逻辑：cookie domain 应该是 provider domain 的后缀
-            if (
-                normalized_provider_domain == normalized_cookie_domain
-                or normalized_provider_domain.endswith("." + normalized_cookie_domain)
-                or normalized_cookie_domain.endswith("." + normalized_provider_domain)
-            ):
-                user_cookies[cookie_name] = cookie_value
+        cookie_domain = cookie.get("domain", "")
+        normalized_cookie_domain = cookie_domain.lstrip(".")
+
+        # 匹配逻辑：cookie domain 与 provider domain 相同，或互为 "." 分隔的后缀
+        # 通过比较后缀前一个字符是否为 "." 判断边界，避免每个 cookie 拼接临时字符串
+        if (
+            normalized_provider_domain == normalized_cookie_domain
+            or normalized_cookie_domain.endswith(provider_domain_suffix)
+            or (
+                normalized_cookie_domain
+                and normalized_provider_domain.endswith(normalized_cookie_domain)
+                and normalized_provider_domain[-len(normalized_cookie_domain) - 1] == "."
+            )
+        ):
+            user_cookies[cookie_name] = cookie_value
+            matched_count += 1
+            if debug:
                 matched_items.append(f"{cookie_name}({cookie_domain})")
-            else:
+        else:
+            filtered_count += 1
+            if debug:
                 filtered_items.append(f"{cookie_name}({cookie_domain})")
 
     if matched_items:
@@ -80,7 +200,7 @@ def filter_cookies(cookies: list[dict], origin: str) -> dict:
 
     print(
         f"🔍 Cookie filtering result ({provider_domain}): "
-        f"{len(matched_items)} matched, {len(filtered_items)} filtered"
+        f"{matched_count} matched, {filtered_count} filtered"
     )
 
     return user_cookies
@@ -92,17 +212,7 @@ def get_random_user_agent() -> str:
     Returns:
         随机选择的 User Agent 字符串
     """
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 " "(KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:134.0) " "Gecko/20100101 Firefox/134.0",
-    ]
-    return random.choice(user_agents)
+    return random.choice(USER_AGENTS)
 
 
 async def take_screenshot(
@@ -120,14 +230,14 @@ async def take_screenshot(
         screenshots_dir: 截图保存目录，默认为 "screenshots"
     """
     try:
-        os.makedirs(screenshots_dir, exist_ok=True)
+        ensure_dir(screenshots_dir)
 
         # 自动生成安全的账号名称
-        safe_account_name = "".join(c if c.isalnum() else "_" for c in account_name)
+        safe_account_name = sanitize_filename(account_name)
 
         # 生成文件名: 账号名_时间戳_原因.png
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_reason = "".join(c if c.isalnum() else "_" for c in reason)
+        safe_reason = sanitize_filename(reason)
         filename = f"{safe_account_name}_{timestamp}_{safe_reason}.png"
         filepath = os.path.join(screenshots_dir, filename)
 
@@ -137,6 +247,27 @@ async def take_screenshot(
         print(f"⚠️ {account_name}: Failed to take screenshot: {e}")
 
 
+async def is_cloudflare_challenge(page) -> bool:
+    """检查当前页面是否为 Cloudflare 验证页面
+
+    只在浏览器内判断并返回布尔值，避免通过 page.content() 传回整个页面 HTML
+
+    Args:
+        page: Camoufox/Playwright 页面对象
+
+    Returns:
+        是否为 Cloudflare 验证页面
+    """
+    if "Just a moment" in await page.title():
+        return True
+
+    # 只检查整页验证的特征，普通页面内嵌的 Turnstile 组件（challenges.cloudflare.com iframe）不算验证页面
+    return await page.evaluate(
+        """() => !!document.querySelector('#challenge-running, #challenge-form')
+            || document.documentElement.outerHTML.includes("Checking your browser")"""
+    )
+
+
 async def save_page_content_to_file(
     page,
     reason: str,
@@ -154,13 +285,13 @@ async def save_page_content_to_file(
         logs_dir: 日志保存目录，默认为 "logs"
     """
     try:
-        os.makedirs(logs_dir, exist_ok=True)
+        ensure_dir(logs_dir)
 
         # 自动生成安全的账号名称
-        safe_account_name = "".join(c if c.isalnum() else "_" for c in account_name)
+        safe_account_name = sanitize_filename(account_name)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_reason = "".join(c if c.isalnum() else "_" for c in reason)
+        safe_reason = sanitize_filename(reason)
         
         # 构建文件名
         if prefix:
@@ -170,8 +301,8 @@ async def save_page_content_to_file(
         filepath = os.path.join(logs_dir, filename)
 
         html_content = await page.content()
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # 在线程中写文件，避免阻塞事件循环
+        await asyncio.to_thread(write_text_file, filepath, html_content)
 
         print(f"📄 {account_name}: Page HTML saved to {filepath}")
     except Exception as e:
@@ -5,7 +5,7 @@
 
 import json
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Callable, Dict, Generator, AsyncGenerator, List, Literal
 
 from utils.get_check_in_status import newapi_check_in_status
@@ -35,9 +35,12 @@ CheckInStatusFunc = Callable[
 ]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProviderConfig:
-    """Provider 配置"""
+    """Provider 配置
+
+    创建后不可修改，各 URL 在 __post_init__ 中预先拼接好，getter 直接返回缓存值
+    """
 
     name: str
     origin: str
@@ -59,6 +62,63 @@ class ProviderConfig:
     aliyun_captcha: bool = False
     bypass_method: Literal["waf_cookies", "cf_clearance"] | None = None
 
+    # 以下为预先拼接的 URL 缓存，不参与构造和比较
+    _login_url: str = field(init=False, repr=False, compare=False)
+    _status_url: str = field(init=False, repr=False, compare=False)
+    _auth_state_url: str = field(init=False, repr=False, compare=False)
+    _check_in_path_is_callable: bool = field(init=False, repr=False, compare=False)
+    _check_in_url_static: str | None = field(init=False, repr=False, compare=False)
+    _user_info_url: str = field(init=False, repr=False, compare=False)
+    _topup_url: str | None = field(init=False, repr=False, compare=False)
+    _github_auth_url: str = field(init=False, repr=False, compare=False)
+    _github_redirect_pattern: str = field(init=False, repr=False, compare=False)
+    _linuxdo_auth_url: str = field(init=False, repr=False, compare=False)
+    _linuxdo_redirect_pattern: str = field(init=False, repr=False, compare=False)
+    _check_in_status_func: CheckInStatusFunc | None = field(init=False, repr=False, compare=False)
+    _needs_waf_cookies: bool = field(init=False, repr=False, compare=False)
+    _needs_cf_clearance: bool = field(init=False, repr=False, compare=False)
+    _needs_manual_check_in: bool = field(init=False, repr=False, compare=False)
+    _needs_manual_topup: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """预先拼接各 URL，frozen dataclass 需通过 object.__setattr__ 赋值"""
+        origin = self.origin
+        object.__setattr__(self, "_login_url", f"{origin}{self.login_path}")
+        object.__setattr__(self, "_status_url", f"{origin}{self.status_path}")
+        object.__setattr__(self, "_auth_state_url", f"{origin}{self.auth_state_path}")
+        check_in_path_is_callable = callable(self.check_in_path)
+        object.__setattr__(self, "_check_in_path_is_callable", check_in_path_is_callable)
+        object.__setattr__(
+            self,
+            "_check_in_url_static",
+            f"{origin}{self.check_in_path}"
+            if self.check_in_path and not check_in_path_is_callable
+            else None,
+        )
+        object.__setattr__(self, "_user_info_url", f"{origin}{self.user_info_path}")
+        object.__setattr__(self, "_topup_url", f"{origin}{self.topup_path}" if self.topup_path else None)
+        object.__setattr__(self, "_github_auth_url", f"{origin}{self.github_auth_path}")
+        object.__setattr__(self, "_github_redirect_pattern", f"**{origin}{self.github_auth_redirect_path}")
+        object.__setattr__(self, "_linuxdo_auth_url", f"{origin}{self.linuxdo_auth_path}")
+        object.__setattr__(self, "_linuxdo_redirect_pattern", f"**{origin}{self.linuxdo_auth_redirect_path}")
+
+        # 签到状态查询函数在构造时确定
+        if self.check_in_status is True:
+            check_in_status_func = newapi_check_in_status
+        elif callable(self.check_in_status):
+            check_in_status_func = self.check_in_status
+        else:
+            check_in_status_func = None
+        object.__setattr__(self, "_check_in_status_func", check_in_status_func)
+
+        # needs_* 判断结果同样在构造时确定
+        object.__setattr__(self, "_needs_waf_cookies", self.bypass_method == "waf_cookies")
+        object.__setattr__(self, "_needs_cf_clearance", self.bypass_method == "cf_clearance")
+        object.__setattr__(self, "_needs_manual_check_in", self.check_in_path is not None)
+        object.__setattr__(
+            self, "_needs_manual_topup", self.topup_path is not None and self.get_cdk is not None
+        )
+
     @classmethod
     def from_dict(cls, name: str, data: dict) -> "ProviderConfig":
         """从字典创建 ProviderConfig
@@ -66,59 +126,46 @@ class ProviderConfig:
         配置格式:
         - 基础: {"origin": "https://example.com"}
         - 完整: {"origin": "https://example.com", "login_path": "/login", "api_user_key": "x-api-user", "bypass_method": "waf_cookies", ...}
+
+        未配置的字段使用 dataclass 默认值，未知字段会被忽略
+        get_cdk 等函数类型无法从 JSON 解析，需要代码中设置
         """
-        return cls(
-            name=name,
-            origin=data["origin"],
-            login_path=data.get("login_path", "/login"),
-            status_path=data.get("status_path", "/api/status"),
-            auth_state_path=data.get("auth_state_path", "api/oauth/state"),
-            check_in_path=data.get("check_in_path"),
-            check_in_status=data.get("check_in_status", False),
-            user_info_path=data.get("user_info_path", "/api/user/self"),
-            topup_path=data.get("topup_path", "/api/user/topup"),
-            get_cdk=data.get("get_cdk"),  # 函数类型无法从 JSON 解析，需要代码中设置
-            api_user_key=data.get("api_user_key", "new-api-user"),
-            github_client_id=data.get("github_client_id"),
-            github_auth_path=data.get("github_auth_path", "/api/oauth/github"),
-            github_auth_redirect_path=data.get("github_auth_redirect_path", "/oauth/**"),
-            linuxdo_client_id=data.get("linuxdo_client_id"),
-            linuxdo_auth_path=data.get("linuxdo_auth_path", "/api/oauth/linuxdo"),
-            linuxdo_auth_redirect_path=data.get("linuxdo_auth_redirect_path", "/oauth/**"),
-            aliyun_captcha=data.get("aliyun_captcha", False),
-            bypass_method=data.get("bypass_method"),
-        )
+        if "origin" not in data:
+            raise KeyError("origin")
+        kwargs = {k: v for k, v in data.items() if k in _PROVIDER_INIT_FIELDS}
+        kwargs["name"] = name
+        return cls(**kwargs)
 
     def needs_waf_cookies(self) -> bool:
         """判断是否需要获取 WAF cookies"""
-        return self.bypass_method == "waf_cookies"
+        return self._needs_waf_cookies
 
     def needs_cf_clearance(self) -> bool:
         """判断是否需要获取 Cloudflare cf_clearance cookie"""
-        return self.bypass_method == "cf_clearance"
+        return self._needs_cf_clearance
 
     def needs_manual_check_in(self) -> bool:
         """判断是否需要手动调用签到接口"""
-        return self.check_in_path is not None
+        return self._needs_manual_check_in
 
     def needs_manual_topup(self) -> bool:
         """判断是否需要手动执行充值（通过 CDK）
         
         当同时配置了 topup_path 和 get_cdk 时，需要执行 execute_topup
         """
-        return self.topup_path is not None and self.get_cdk is not None
+        return self._needs_manual_topup
 
     def get_login_url(self) -> str:
         """获取登录 URL"""
-        return f"{self.origin}{self.login_path}"
+        return self._login_url
 
     def get_status_url(self) -> str:
         """获取状态 URL"""
-        return f"{self.origin}{self.status_path}"
+        return self._status_url
 
     def get_auth_state_url(self) -> str:
         """获取认证状态 URL"""
-        return f"{self.origin}{self.auth_state_path}"
+        return self._auth_state_url
 
     def get_check_in_url(self, user_id: str | int) -> str | None:
         """获取签到 URL
@@ -131,15 +178,12 @@ class ProviderConfig:
         Returns:
             str | None: 签到 URL，如果不需要签到则返回 None
         """
-        if not self.check_in_path:
-            return None
-
         # 如果是函数，则调用函数生成 URL
-        if callable(self.check_in_path):
+        if self._check_in_path_is_callable:
             return self.check_in_path(self.origin, user_id)
 
-        # 否则拼接路径
-        return f"{self.origin}{self.check_in_path}"
+        # 否则返回预先拼接好的 URL（未配置时为 None）
+        return self._check_in_url_static
 
     def get_check_in_status_func(self) -> CheckInStatusFunc | None:
         """获取签到状态查询函数
@@ -149,25 +193,19 @@ class ProviderConfig:
             如果 check_in_status 为 callable，返回该函数
             否则返回 None
         """
-        if self.check_in_status is True:
-            return newapi_check_in_status
-        if callable(self.check_in_status):
-            return self.check_in_status
-        return None
+        return self._check_in_status_func
 
     def get_user_info_url(self) -> str:
         """获取用户信息 URL"""
-        return f"{self.origin}{self.user_info_path}"
+        return self._user_info_url
 
     def get_topup_url(self) -> str | None:
         """获取充值 URL"""
-        if not self.topup_path:
-            return None
-        return f"{self.origin}{self.topup_path}"
+        return self._topup_url
 
     def get_github_auth_url(self) -> str:
         """获取 GitHub 认证 URL"""
-        return f"{self.origin}{self.github_auth_path}"
+        return self._github_auth_url
 
     def get_github_auth_redirect_pattern(self) -> str:
         """获取 GitHub OAuth 回调 URL 匹配模式
@@ -175,11 +213,11 @@ class ProviderConfig:
         返回用于 page.wait_for_url() 的匹配模式，支持通配符 **
         例如: "**https://example.com/oauth/**" 或 "**https://example.com/oauth-redirect.html**"
         """
-        return f"**{self.origin}{self.github_auth_redirect_path}"
+        return self._github_redirect_pattern
 
     def get_linuxdo_auth_url(self) -> str:
         """获取 LinuxDo 认证 URL"""
-        return f"{self.origin}{self.linuxdo_auth_path}"
+        return self._linuxdo_auth_url
 
     def get_linuxdo_auth_redirect_pattern(self) -> str:
         """获取 LinuxDo OAuth 回调 URL 匹配模式
@@ -187,9 +225,14 @@ class ProviderConfig:
         返回用于 page.wait_for_url() 的匹配模式，支持通配符 **
         例如: "**https://example.com/oauth/**" 或 "**https://example.com/oauth-redirect.html**"
         """
-        return f"**{self.origin}{self.linuxdo_auth_redirect_path}"
+        return self._linuxdo_redirect_pattern
+
+
+# ProviderConfig 构造参数名（不含预先拼接的 URL 缓存字段），供 from_dict 过滤使用
+_PROVIDER_INIT_FIELDS = frozenset(f.name for f in fields(ProviderConfig) if f.init)
 
-@dataclass
+
+@dataclass(slots=True)
 class OAuthAccountConfig:
     """OAuth 账号配置（用于 linux.do 和 github）"""
     username: str
@@ -206,7 +249,11 @@ class OAuthAccountConfig:
         )
 
 
-@dataclass
+# AccountConfig.from_dict 中单独解析的字段，其余字段存入 extra
+_ACCOUNT_KNOWN_KEYS = frozenset({"provider", "name", "cookies", "api_user", "linux.do", "github", "proxy"})
+
+
+@dataclass(slots=True)
 class AccountConfig:
     """账号配置"""
 
@@ -240,10 +287,10 @@ class AccountConfig:
         cookies = data.get("cookies", "")
         proxy = data.get("proxy")
 
-        # 提取已知字段
-        known_keys = {"provider", "name", "cookies", "api_user", "linux.do", "github", "proxy"}
-        # 收集额外的配置字段
-        extra = {k: v for k, v in data.items() if k not in known_keys}
+        # 收集额外的配置字段：复制后移除已知字段
+        extra = data.copy()
+        for key in _ACCOUNT_KNOWN_KEYS:
+            extra.pop(key, None)
 
         return cls(
             provider=provider,
@@ -265,13 +312,400 @@ class AccountConfig:
 
     def get(self, key: str, default=None):
         """获取配置值，优先从已知属性获取，否则从 extra 中获取"""
-        if hasattr(self, key) and key != "extra":
+        if key in _ACCOUNT_CONFIG_FIELDS:
             value = getattr(self, key)
             return value if value is not None else default
         return self.extra.get(key, default)
 
 
-@dataclass
+# AccountConfig 的字段名（不含 extra），供 get() 判断是否为已知属性
+_ACCOUNT_CONFIG_FIELDS = frozenset(f.name for f in fields(AccountConfig) if f.name != "extra")
+
+
+# 内置 providers 配置，模块导入时构建一次；ProviderConfig 不可修改，可安全浅拷贝复用
+_DEFAULT_PROVIDERS: Dict[str, ProviderConfig] = {
+    "anyrouter": ProviderConfig(
+        name="anyrouter",
+        origin="https://anyrouter.top",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/sign_in",
+        check_in_status=False,
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        api_user_key="new-api-user",
+        github_client_id="Ov23liOwlnIiYoF3bUqw",
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="8w2uZtoWH9AUXrZr1qeCEEmvXLafea3c",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method="waf_cookies",
+    ),
+    "agentrouter": ProviderConfig(
+        name="agentrouter",
+        origin="https://agentrouter.org",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path=None,  # 无需签到接口，查询用户信息时自动完成签到
+        check_in_status=False,
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        api_user_key="new-api-user",
+        github_client_id="Ov23lidtiR4LeVZvVRNL",
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="KZUecGfhhDZMVnv8UtEdhOhf9sNOhqVX",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=True,
+        bypass_method=None,
+    ),
+    "wong": ProviderConfig(
+        name="wong",
+        origin="https://wzw.pp.ua",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",
+        check_in_status=False,
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path=None,
+        linuxdo_client_id="451QxPCe4n9e7XrvzokzPcqPH9rUyTQF",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "huan666": ProviderConfig(
+        name="huan666",
+        origin="https://ai.huan666.de",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path=None,
+        linuxdo_client_id="FNvJFnlfpfDM2mKDp8HTElASdjEwUriS",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "runawaytime": ProviderConfig(
+        name="runawaytime",
+        origin="https://runanytime.hxi.me",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=get_runawaytime_cdk,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path=None,
+        linuxdo_client_id="AHjK9O3FfbCXKpF6VXGBC60K21yJ2fYk",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method="cf_clearance",
+    ),
+    "x666": ProviderConfig(
+        name="x666",
+        origin="https://x666.me",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path=None,  # 签到通过 up.x666.me 完成
+        check_in_status=False,
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=get_x666_cdk,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path=None,
+        linuxdo_client_id="4OtAotK6cp4047lgPD4kPXNhWRbRdTw3",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "kfc": ProviderConfig(
+        name="kfc",
+        origin="https://kfc-api.sxxe.net",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="UZgHjwXCE3HTrsNMjjEi0d8wpcj7d4Of",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "neb": ProviderConfig(
+        name="neb",
+        origin="https://ai.zzhdsgsss.xyz",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="ZflEL6xK90fbCcuWpHEKAcofgK8B5msn",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "elysiver": ProviderConfig(
+        name="elysiver",
+        origin="https://elysiver.h-e.top",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        github_auth_redirect_path="/oauth-redirect.html**",  # 使用 oauth-redirect.html 页面
+        linuxdo_client_id="E2eaCQVl9iecd4aJBeTKedXfeKiJpSPF",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        linuxdo_auth_redirect_path="/oauth-redirect.html**",  # 使用 oauth-redirect.html 页面
+        aliyun_captcha=False,
+        bypass_method="cf_clearance",
+    ),
+    "hotaru": ProviderConfig(
+        name="hotaru",
+        origin="https://api.hotaruapi.top",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="qVGkHnU8fLzJVEMgHCuNUCYifUQwePWn",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method="cf_clearance",
+    ),
+    "b4u": ProviderConfig(
+        name="b4u",
+        origin="https://b4u.qzz.io",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path=None,  # 无签到接口，通过 luckydraw 获取 CDK 并 topup
+        check_in_status=False,
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=get_b4u_cdk,  # 通过 tw.b4u.qzz.io/luckydraw 抽奖获取 CDK
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="Cf3PtT3ecj4kzJrMvOGM48FrHFKYXusb",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method="cf_clearance",
+    ),
+    "lightllm": ProviderConfig(
+        name="lightllm",
+        origin="https://lightllm.online",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="i7YfDNeJPx8Rbjx8JpD10YgQ2TVElVA4",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "takeapi": ProviderConfig(
+        name="takeapi",
+        origin="https://codex.661118.xyz",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="CeGKoyvGjd9JuUYOz57qbOqcM3ur3Y69",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "thatapi": ProviderConfig(
+        name="thatapi",
+        origin="https://gyapi.zxiaoruan.cn",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="doAqU5TVU6L7sXudST9MQ102aaJObESS",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "duckcoding": ProviderConfig(
+        name="duckcoding",
+        origin="https://duckcoding.com",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id="Ov23liCuWV2QS06gWce0",
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="MGPwGpfcyKGHsdnsY0BMpt6VZPrkxOBd",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "free-duckcoding": ProviderConfig(
+        name="free-duckcoding",
+        origin="https://free.duckcoding.com",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",
+        check_in_status=True,
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="XNJfOdoSeXkcx80mDydoheJ0nZS4tjIf",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "taizi": ProviderConfig(
+        name="taizi",
+        origin="https://taizi.api.51yp.de5.net",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="ed4CnVPkYpQZSLFdha2pHFtHJOmHQ4bU",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "openai-test": ProviderConfig(
+        name="openai-test",
+        origin="https://openai.api-test.us.ci",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="65Lj7gYXHoSAVDDUq6Plb11thoqAV1t7",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "icat": ProviderConfig(
+        name="icat",
+        origin="https://icat.pp.ua",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="BNbUbjpOVvGdht0rnHcE0KvB2gUwCq02",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+    "xuezha": ProviderConfig(
+        name="xuezha",
+        origin="https://gptkey.eu.org",
+        login_path="/login",
+        status_path="/api/status",
+        auth_state_path="/api/oauth/state",
+        check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
+        check_in_status=True,  # 使用标准签到状态查询
+        user_info_path="/api/user/self",
+        topup_path="/api/user/topup",
+        get_cdk=None,
+        api_user_key="new-api-user",
+        github_client_id=None,
+        github_auth_path="/api/oauth/github",
+        linuxdo_client_id="GQbxiQJyJbl2e5yCYZTQx6tv99cY3ed6",
+        linuxdo_auth_path="/api/oauth/linuxdo",
+        aliyun_captcha=False,
+        bypass_method=None,
+    ),
+}
+
+
+@dataclass(slots=True)
 class AppConfig:
     """应用配置"""
 
@@ -280,6 +714,7 @@ class AppConfig:
     linux_do_accounts: List["OAuthAccountConfig"] = field(default_factory=list)  # 全局 Linux.do 账号列表
     github_accounts: List["OAuthAccountConfig"] = field(default_factory=list)  # 全局 GitHub 账号列表
     global_proxy: Dict | None = None
+    max_parallel: int = 1  # 同时处理的账号数量上限
 
     @classmethod
     def load_from_env(
@@ -289,6 +724,7 @@ class AppConfig:
         linux_do_accounts_env: str = "ACCOUNTS_LINUX_DO",
         github_accounts_env: str = "ACCOUNTS_GITHUB",
         proxy_env: str = "PROXY",
+        max_parallel_env: str = "MAX_PARALLEL",
     ) -> "AppConfig":
         """从环境变量加载配置
         
@@ -298,6 +734,7 @@ class AppConfig:
             linux_do_accounts_env: Linux.do 账号配置的环境变量名称，默认为 "ACCOUNTS_LINUX_DO"
             github_accounts_env: GitHub 账号配置的环境变量名称，默认为 "ACCOUNTS_GITHUB"
             proxy_env: 全局代理配置的环境变量名称，默认为 "PROXY"
+            max_parallel_env: 账号并发数量的环境变量名称，默认为 "MAX_PARALLEL"
         """
         # 加载 providers 配置
         providers = cls._load_providers(providers_env)
@@ -312,14 +749,45 @@ class AppConfig:
         # 加载全局代理配置
         global_proxy = cls._load_proxy(proxy_env)
 
+        # 加载账号并发数量
+        max_parallel = cls._load_max_parallel(max_parallel_env)
+
         return cls(
             providers=providers,
             accounts=accounts,
             linux_do_accounts=linux_do_accounts,
             github_accounts=github_accounts,
             global_proxy=global_proxy,
+            max_parallel=max_parallel,
         )
 
+    @classmethod
+    def _load_max_parallel(cls, max_parallel_env: str) -> int:
+        """从环境变量加载账号并发数量
+
+        Args:
+            max_parallel_env: 环境变量名称
+
+        Returns:
+            并发数量，未配置或配置无效时返回 1（逐个处理）
+        """
+        max_parallel_str = os.getenv(max_parallel_env)
+        if not max_parallel_str:
+            return 1
+
+        try:
+            max_parallel = int(max_parallel_str)
+        except ValueError:
+            print(f"⚠️ Invalid {max_parallel_env} value: {max_parallel_str}, using 1")
+            return 1
+
+        if max_parallel < 1:
+            print(f"⚠️ {max_parallel_env} must be at least 1, using 1")
+            return 1
+
+        print(f"⚙️ Processing up to {max_parallel} account(s) in parallel")
+        return max_parallel
+
     @classmethod
     def _load_proxy(cls, proxy_env: str) -> Dict | None:
         """从环境变量加载全局代理配置
@@ -355,386 +823,7 @@ class AppConfig:
         Returns:
             providers 配置字典
         """
-        providers = {
-            "anyrouter": ProviderConfig(
-                name="anyrouter",
-                origin="https://anyrouter.top",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/sign_in",
-                check_in_status=False,
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                api_user_key="new-api-user",
-                github_client_id="Ov23liOwlnIiYoF3bUqw",
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="8w2uZtoWH9AUXrZr1qeCEEmvXLafea3c",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method="waf_cookies",
-            ),
-            "agentrouter": ProviderConfig(
-                name="agentrouter",
-                origin="https://agentrouter.org",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path=None,  # 无需签到接口，查询用户信息时自动完成签到
-                check_in_status=False,
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                api_user_key="new-api-user",
-                github_client_id="Ov23lidtiR4LeVZvVRNL",
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="KZUecGfhhDZMVnv8UtEdhOhf9sNOhqVX",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=True,
-                bypass_method=None,
-            ),
-            "wong": ProviderConfig(
-                name="wong",
-                origin="https://wzw.pp.ua",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",
-                check_in_status=False,
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path=None,
-                linuxdo_client_id="451QxPCe4n9e7XrvzokzPcqPH9rUyTQF",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "huan666": ProviderConfig(
-                name="huan666",
-                origin="https://ai.huan666.de",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path=None,
-                linuxdo_client_id="FNvJFnlfpfDM2mKDp8HTElASdjEwUriS",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "runawaytime": ProviderConfig(
-                name="runawaytime",
-                origin="https://runanytime.hxi.me",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=get_runawaytime_cdk,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path=None,
-                linuxdo_client_id="AHjK9O3FfbCXKpF6VXGBC60K21yJ2fYk",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method="cf_clearance",
-            ),
-            "x666": ProviderConfig(
-                name="x666",
-                origin="https://x666.me",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path=None,  # 签到通过 up.x666.me 完成
-                check_in_status=False,
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=get_x666_cdk,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path=None,
-                linuxdo_client_id="4OtAotK6cp4047lgPD4kPXNhWRbRdTw3",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "kfc": ProviderConfig(
-                name="kfc",
-                origin="https://kfc-api.sxxe.net",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="UZgHjwXCE3HTrsNMjjEi0d8wpcj7d4Of",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "neb": ProviderConfig(
-                name="neb",
-                origin="https://ai.zzhdsgsss.xyz",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="ZflEL6xK90fbCcuWpHEKAcofgK8B5msn",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "elysiver": ProviderConfig(
-                name="elysiver",
-                origin="https://elysiver.h-e.top",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                github_auth_redirect_path="/oauth-redirect.html**",  # 使用 oauth-redirect.html 页面
-                linuxdo_client_id="E2eaCQVl9iecd4aJBeTKedXfeKiJpSPF",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                linuxdo_auth_redirect_path="/oauth-redirect.html**",  # 使用 oauth-redirect.html 页面
-                aliyun_captcha=False,
-                bypass_method="cf_clearance",
-            ),
-            "hotaru": ProviderConfig(
-                name="hotaru",
-                origin="https://api.hotaruapi.top",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="qVGkHnU8fLzJVEMgHCuNUCYifUQwePWn",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method="cf_clearance",
-            ),
-            "b4u": ProviderConfig(
-                name="b4u",
-                origin="https://b4u.qzz.io",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path=None,  # 无签到接口，通过 luckydraw 获取 CDK 并 topup
-                check_in_status=False,
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=get_b4u_cdk,  # 通过 tw.b4u.qzz.io/luckydraw 抽奖获取 CDK
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="Cf3PtT3ecj4kzJrMvOGM48FrHFKYXusb",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method="cf_clearance",
-            ),
-            "lightllm": ProviderConfig(
-                name="lightllm",
-                origin="https://lightllm.online",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="i7YfDNeJPx8Rbjx8JpD10YgQ2TVElVA4",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "takeapi": ProviderConfig(
-                name="takeapi",
-                origin="https://codex.661118.xyz",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="CeGKoyvGjd9JuUYOz57qbOqcM3ur3Y69",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "thatapi": ProviderConfig(
-                name="thatapi",
-                origin="https://gyapi.zxiaoruan.cn",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="doAqU5TVU6L7sXudST9MQ102aaJObESS",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "duckcoding": ProviderConfig(
-                name="duckcoding",
-                origin="https://duckcoding.com",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id="Ov23liCuWV2QS06gWce0",
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="MGPwGpfcyKGHsdnsY0BMpt6VZPrkxOBd",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "free-duckcoding": ProviderConfig(
-                name="free-duckcoding",
-                origin="https://free.duckcoding.com",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",
-                check_in_status=True,
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="XNJfOdoSeXkcx80mDydoheJ0nZS4tjIf",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "taizi": ProviderConfig(
-                name="taizi",
-                origin="https://taizi.api.51yp.de5.net",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="ed4CnVPkYpQZSLFdha2pHFtHJOmHQ4bU",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "openai-test": ProviderConfig(
-                name="openai-test",
-                origin="https://openai.api-test.us.ci",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="65Lj7gYXHoSAVDDUq6Plb11thoqAV1t7",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "icat": ProviderConfig(
-                name="icat",
-                origin="https://icat.pp.ua",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="BNbUbjpOVvGdht0rnHcE0KvB2gUwCq02",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-            "xuezha": ProviderConfig(
-                name="xuezha",
-                origin="https://gptkey.eu.org",
-                login_path="/login",
-                status_path="/api/status",
-                auth_state_path="/api/oauth/state",
-                check_in_path="/api/user/checkin",  # 标准 newapi checkin 接口
-                check_in_status=True,  # 使用标准签到状态查询
-                user_info_path="/api/user/self",
-                topup_path="/api/user/topup",
-                get_cdk=None,
-                api_user_key="new-api-user",
-                github_client_id=None,
-                github_auth_path="/api/oauth/github",
-                linuxdo_client_id="GQbxiQJyJbl2e5yCYZTQx6tv99cY3ed6",
-                linuxdo_auth_path="/api/oauth/linuxdo",
-                aliyun_captcha=False,
-                bypass_method=None,
-            ),
-        }
+        providers = dict(_DEFAULT_PROVIDERS)
 
         # 尝试从环境变量加载自定义 providers
         providers_str = os.getenv(providers_env)
@@ -778,7 +867,8 @@ class AppConfig:
         """
         accounts_str = os.getenv(env_name)
         
-        if not accounts_str:
+        # 未设置或仅包含空白时直接跳过，无需进入 JSON 解析
+        if not accounts_str or accounts_str.isspace():
             print(f"⚠️ {env_name} No {provider_name} account(s) from {env_name}")
             return []
 
@@ -907,7 +997,8 @@ class AppConfig:
         # 从环境变量获取账号配置
         accounts_str = os.getenv(accounts_env)
         
-        if not accounts_str:
+        # 未设置或仅包含空白时直接跳过，无需进入 JSON 解析
+        if not accounts_str or accounts_str.isspace():
             print(f"⚠️ {accounts_env} environment variable not found")
             return []
 
@@ -3,29 +3,142 @@
 CDK 获取模块
 
 提供各个 provider 的 CDK 获取函数
-同步函数返回 Generator[tuple[bool, dict], None, None]，每次 yield 一个元组：
+均为异步函数，返回 AsyncGenerator[tuple[bool, dict], None]，每次 yield 一个元组：
   - (True, {"code": "xxx"}) 表示成功获取 CDK，code 可为空字符串表示不需要充值
   - (False, {"error": "error message"}) 表示失败，调用方应停止 topup
-异步函数返回 AsyncGenerator[tuple[bool, dict], None]，格式同上
+调用方同时兼容返回 Generator 的同步函数
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Generator, AsyncGenerator
+import json
+from typing import TYPE_CHECKING, AsyncGenerator
 
 from curl_cffi import requests as curl_requests
 
-from utils.http_utils import proxy_resolve, response_resolve
+from utils.browser_utils import is_debug
+from utils.http_utils import is_cf_challenge_response, proxy_resolve, response_resolve
 from utils.get_headers import get_curl_cffi_impersonate
-from utils.get_cf_clearance import get_cf_clearance
 
 if TYPE_CHECKING:
     from utils.config import AccountConfig
 
 
-def get_runawaytime_cdk(
+# fuli.hxi.me 基础请求头
+RUNAWAYTIME_BASE_HEADERS = {
+    "accept": "*/*",
+    "accept-language": "en,en-US;q=0.9,zh;q=0.8",
+    "cache-control": "no-cache",
+    "pragma": "no-cache",
+    "sec-ch-ua": '"Google Chrome";v="143", "Chromium";v="143", "Not A(Brand";v="24"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"macOS"',
+    "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
+}
+
+# fuli.hxi.me 各接口请求头，导入时构建一次，请求时直接复用
+RUNAWAYTIME_STATUS_HEADERS = {
+    **RUNAWAYTIME_BASE_HEADERS,
+    "referer": "https://fuli.hxi.me/",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+}
+RUNAWAYTIME_CHECKIN_HEADERS = {
+    **RUNAWAYTIME_BASE_HEADERS,
+    "content-length": "0",
+    "origin": "https://fuli.hxi.me",
+    "referer": "https://fuli.hxi.me/",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+}
+RUNAWAYTIME_WHEEL_STATUS_HEADERS = {
+    **RUNAWAYTIME_BASE_HEADERS,
+    "referer": "https://fuli.hxi.me/wheel",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+}
+RUNAWAYTIME_WHEEL_HEADERS = {
+    **RUNAWAYTIME_BASE_HEADERS,
+    "content-length": "0",
+    "origin": "https://fuli.hxi.me",
+    "referer": "https://fuli.hxi.me/wheel",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+}
+
+# up.x666.me 基础请求头
+X666_BASE_HEADERS = {
+    "accept": "*/*",
+    "accept-language": "en,en-US;q=0.9,zh;q=0.8,en-CN;q=0.7,zh-CN;q=0.6",
+    "cache-control": "no-cache",
+    "pragma": "no-cache",
+    "sec-ch-ua": '"Google Chrome";v="143", "Chromium";v="143", "Not A(Brand";v="24"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"macOS"',
+    "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
+}
+
+# up.x666.me 各接口请求头（不含 authorization，请求时按账号补充）
+X666_STATUS_HEADERS = {
+    **X666_BASE_HEADERS,
+    "referer": "https://up.x666.me/",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+}
+X666_SPIN_HEADERS = {
+    **X666_BASE_HEADERS,
+    "content-length": "0",
+    "content-type": "application/json",
+    "origin": "https://up.x666.me",
+    "referer": "https://up.x666.me/",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+}
+
+# tw.b4u.qzz.io/luckydraw 的 Next.js Server Actions 标识
+B4U_STATUS_ACTION = "7a7a7bf7f7c47cf1a8351d225a4338b0f017cd35"
+B4U_DRAW_ACTION = "cfc5966b4123c674815ce067b6b8894545c15604"
+# Next.js Server Actions 需要的 next-router-state-tree header
+B4U_NEXT_ROUTER_STATE_TREE = "%5B%22%22%2C%7B%22children%22%3A%5B%22(dashboard)%22%2C%7B%22children%22%3A%5B%22luckydraw%22%2C%7B%22children%22%3A%5B%22__PAGE__%22%2C%7B%7D%2C%22%2Fluckydraw%22%2C%22refresh%22%5D%7D%5D%7D%5D%7D%2Cnull%2Cnull%2Ctrue%5D"
+
+
+def find_action_line(response_text: str, prefix: str = "1:") -> str | None:
+    """在 Next.js Server Action 响应中查找以指定前缀开头的第一行
+
+    响应格式如: 0:["$@1",["xxx",null]]\n1:{...}
+    使用 str.find 定位，不需要把整个响应拆分成行列表
+
+    Args:
+        response_text: 响应文本
+        prefix: 行前缀，默认为 "1:"
+
+    Returns:
+        去掉前缀后的行内容，未找到时返回 None
+    """
+    response_text = response_text.strip()
+    if response_text.startswith(prefix):
+        start = len(prefix)
+    else:
+        index = response_text.find(f"\n{prefix}")
+        if index == -1:
+            return None
+        start = index + 1 + len(prefix)
+
+    end = response_text.find("\n", start)
+    return response_text[start:] if end == -1 else response_text[start:end]
+
+
+async def get_runawaytime_cdk(
     account_config: "AccountConfig",
-) -> Generator[tuple[bool, dict], None, None]:
-    """获取 runawaytime CDK（签到 + 大转盘）
+) -> AsyncGenerator[tuple[bool, dict], None]:
+    """获取 runawaytime CDK（签到 + 大转盘，异步生成器）
 
     通过 fuli.hxi.me 签到和大转盘获取 CDK
 
@@ -50,40 +163,17 @@ def get_runawaytime_cdk(
     http_proxy = proxy_resolve(proxy_config)
 
     try:
-        session = curl_requests.Session(proxy=http_proxy, timeout=30)
+        session = curl_requests.AsyncSession(proxy=http_proxy, timeout=30)
         try:
-            # 构建基础请求头
-            headers = {
-                "accept": "*/*",
-                "accept-language": "en,en-US;q=0.9,zh;q=0.8",
-                "cache-control": "no-cache",
-                "pragma": "no-cache",
-                "sec-ch-ua": '"Google Chrome";v="143", "Chromium";v="143", "Not A(Brand";v="24"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"macOS"',
-                "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
-            }
-
             # 设置 cookies
             session.cookies.update(get_cdk_cookies)
             session.cookies.set("i18next", "en")
 
             # ===== 第一部分：签到 =====
             # 先检查签到状态
-            status_headers = headers.copy()
-            status_headers.update(
-                {
-                    "referer": "https://fuli.hxi.me/",
-                    "sec-fetch-dest": "empty",
-                    "sec-fetch-mode": "cors",
-                    "sec-fetch-site": "same-origin",
-                }
-            )
-
-            status_response = session.get(
+            status_response = await session.get(
                 "https://fuli.hxi.me/api/checkin/status",
-                headers=status_headers,
+                headers=RUNAWAYTIME_STATUS_HEADERS,
                 timeout=30,
             )
 
@@ -96,21 +186,9 @@ def get_runawaytime_cdk(
 
             if not already_checked_in:
                 # 执行签到
-                checkin_headers = headers.copy()
-                checkin_headers.update(
-                    {
-                        "content-length": "0",
-                        "origin": "https://fuli.hxi.me",
-                        "referer": "https://fuli.hxi.me/",
-                        "sec-fetch-dest": "empty",
-                        "sec-fetch-mode": "cors",
-                        "sec-fetch-site": "same-origin",
-                    }
-                )
-
-                response = session.post(
+                response = await session.post(
                     "https://fuli.hxi.me/api/checkin",
-                    headers=checkin_headers,
+                    headers=RUNAWAYTIME_CHECKIN_HEADERS,
                     timeout=30,
                 )
 
@@ -131,19 +209,9 @@ def get_runawaytime_cdk(
 
             # ===== 第二部分：大转盘 =====
             # 先检查大转盘状态
-            wheel_status_headers = headers.copy()
-            wheel_status_headers.update(
-                {
-                    "referer": "https://fuli.hxi.me/wheel",
-                    "sec-fetch-dest": "empty",
-                    "sec-fetch-mode": "cors",
-                    "sec-fetch-site": "same-origin",
-                }
-            )
-
-            wheel_status_response = session.get(
+            wheel_status_response = await session.get(
                 "https://fuli.hxi.me/api/wheel/status",
-                headers=wheel_status_headers,
+                headers=RUNAWAYTIME_WHEEL_STATUS_HEADERS,
                 timeout=30,
             )
 
@@ -159,24 +227,12 @@ def get_runawaytime_cdk(
 
             # 执行大转盘（循环直到 remaining <= 0）
             if remaining > 0:
-                wheel_headers = headers.copy()
-                wheel_headers.update(
-                    {
-                        "content-length": "0",
-                        "origin": "https://fuli.hxi.me",
-                        "referer": "https://fuli.hxi.me/wheel",
-                        "sec-fetch-dest": "empty",
-                        "sec-fetch-mode": "cors",
-                        "sec-fetch-site": "same-origin",
-                    }
-                )
-
                 spin_count = 0
 
                 while remaining > 0:
-                    response = session.post(
+                    response = await session.post(
                         "https://fuli.hxi.me/api/wheel",
-                        headers=wheel_headers,
+                        headers=RUNAWAYTIME_WHEEL_HEADERS,
                         timeout=30,
                     )
 
@@ -215,16 +271,16 @@ def get_runawaytime_cdk(
                 if spin_count > 0:
                     print(f"✅ {account_name}: Total {spin_count} CDK(s) obtained from wheel")
         finally:
-            session.close()
+            await session.close()
     except Exception as e:
         print(f"❌ {account_name}: Error getting runawaytime CDK - {e}")
         yield False, {"error": f"Error getting runawaytime CDK - {e}"}
 
 
-def get_x666_cdk(
+async def get_x666_cdk(
     account_config: "AccountConfig",
-) -> Generator[tuple[bool, dict], None, None]:
-    """执行 x666 每日抽奖（直接充值到账户）
+) -> AsyncGenerator[tuple[bool, dict], None]:
+    """执行 x666 每日抽奖（直接充值到账户，异步生成器）
 
     通过 up.x666.me 抽奖，奖励直接充值到账户，不返回 CDK
     此函数作为 get_cdk 使用，成功时返回空 code 表示不需要充值
@@ -247,36 +303,15 @@ def get_x666_cdk(
     http_proxy = proxy_resolve(proxy)
 
     try:
-        session = curl_requests.Session(proxy=http_proxy, timeout=30)
+        session = curl_requests.AsyncSession(proxy=http_proxy, timeout=30)
         try:
-            # 构建基础请求头
-            headers = {
-                "accept": "*/*",
-                "accept-language": "en,en-US;q=0.9,zh;q=0.8,en-CN;q=0.7,zh-CN;q=0.6",
-                "cache-control": "no-cache",
-                "pragma": "no-cache",
-                "sec-ch-ua": '"Google Chrome";v="143", "Chromium";v="143", "Not A(Brand";v="24"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"macOS"',
-                "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
-            }
-
             session.cookies.set("i18next", "en")
+            authorization = f"Bearer {access_token}"
 
             # 先获取用户信息，检查是否可以抽奖
-            status_headers = headers.copy()
-            status_headers.update(
-                {
-                    "authorization": f"Bearer {access_token}",
-                    "referer": "https://up.x666.me/",
-                    "sec-fetch-dest": "empty",
-                    "sec-fetch-mode": "cors",
-                    "sec-fetch-site": "same-origin",
-                }
-            )
+            status_headers = {**X666_STATUS_HEADERS, "authorization": authorization}
 
-            status_response = session.get(
+            status_response = await session.get(
                 "https://up.x666.me/api/checkin/status",
                 headers=status_headers,
                 timeout=30,
@@ -309,21 +344,9 @@ def get_x666_cdk(
                 return
 
             # 执行抽奖
-            spin_headers = headers.copy()
-            spin_headers.update(
-                {
-                    "authorization": f"Bearer {access_token}",
-                    "content-length": "0",
-                    "content-type": "application/json",
-                    "origin": "https://up.x666.me",
-                    "referer": "https://up.x666.me/",
-                    "sec-fetch-dest": "empty",
-                    "sec-fetch-mode": "cors",
-                    "sec-fetch-site": "same-origin",
-                }
-            )
+            spin_headers = {**X666_SPIN_HEADERS, "authorization": authorization}
 
-            response = session.post(
+            response = await session.post(
                 "https://up.x666.me/api/checkin/spin",
                 headers=spin_headers,
                 timeout=30,
@@ -357,7 +380,7 @@ def get_x666_cdk(
                 print(f"❌ {account_name}: Spin failed, HTTP {response.status_code}")
                 yield False, {"error": f"Spin failed, HTTP {response.status_code}"}
         finally:
-            session.close()
+            await session.close()
     except Exception as e:
         print(f"❌ {account_name}: Error executing x666 spin - {e}")
         yield False, {"error": f"Error executing x666 spin - {e}"}
@@ -377,7 +400,9 @@ async def get_b4u_cdk(
     Yields:
         tuple[bool, dict]: (True, {"code": "xxx"}) 成功，(False, {"error": "msg"}) 失败
     """
-    account_name = account_config.get_display_name()
+    # 账号索引由 CheckIn 写入 extra，用于按账号缓存 cf_clearance
+    account_index = account_config.get("account_index")
+    account_name = account_config.get_display_name(account_index or 0)
     get_cdk_cookies = account_config.get("get_cdk_cookies")
 
     if not get_cdk_cookies:
@@ -389,12 +414,16 @@ async def get_b4u_cdk(
     proxy_config = account_config.proxy or account_config.get("global_proxy")
     http_proxy = proxy_resolve(proxy_config)
 
-    # 获取 cf_clearance cookie（使用公共方法，直接 await）
+    # 延迟导入，避免加载配置模块时引入 Camoufox
+    from utils.get_cf_clearance import get_cf_clearance_cached, invalidate_cf_clearance_cache
+
+    # 获取 cf_clearance cookie（同一账号在有效期内复用）
     print(f"ℹ️ {account_name}: Getting cf_clearance for tw.b4u.qzz.io...")
     try:
-        cf_cookies, browser_headers = await get_cf_clearance(
+        cf_cookies, browser_headers = await get_cf_clearance_cached(
             url="https://tw.b4u.qzz.io/luckydraw",
             account_name=account_name,
+            account_index=account_index,
             proxy_config=proxy_config,
         )
     except Exception as e:
@@ -465,13 +494,12 @@ async def get_b4u_cdk(
             session.cookies.update(get_cdk_cookies)
             session.cookies.set("i18next", "en")
 
-            # Next.js Server Actions 需要的 next-router-state-tree header
-            next_router_state_tree = "%5B%22%22%2C%7B%22children%22%3A%5B%22(dashboard)%22%2C%7B%22children%22%3A%5B%22luckydraw%22%2C%7B%22children%22%3A%5B%22__PAGE__%22%2C%7B%7D%2C%22%2Fluckydraw%22%2C%22refresh%22%5D%7D%5D%7D%5D%7D%2Cnull%2Cnull%2Ctrue%5D"
-
             # ===== 第一步：检查抽奖状态 =====
-            status_headers = headers.copy()
-            status_headers["next-action"] = "7a7a7bf7f7c47cf1a8351d225a4338b0f017cd35"
-            status_headers["next-router-state-tree"] = next_router_state_tree
+            status_headers = {
+                **headers,
+                "next-action": B4U_STATUS_ACTION,
+                "next-router-state-tree": B4U_NEXT_ROUTER_STATE_TREE,
+            }
 
             status_response = session.post(
                 "https://tw.b4u.qzz.io/luckydraw",
@@ -480,29 +508,30 @@ async def get_b4u_cdk(
                 timeout=30,
             )
 
-            import json
-
             remaining = 0
             if status_response.status_code == 200:
                 # 解析响应，格式如: 0:["$@1",["xxx",null]]\n1:1
                 # 其中 "1:N" 的 N 表示剩余抽奖次数
                 response_text = status_response.text
-                print(f"ℹ️ {account_name}: Luckydraw status response: {response_text[:200]}")
+                if is_debug():
+                    print(f"ℹ️ {account_name}: Luckydraw status response: {response_text[:200]}")
 
                 # 解析剩余次数
-                lines = response_text.strip().split("\n")
-                for line in lines:
-                    if line.startswith("1:"):
-                        try:
-                            remaining = int(line[2:])
-                            print(f"ℹ️ {account_name}: Remaining draws: {remaining}")
-                        except ValueError:
-                            # 不是数字，可能是其他格式
-                            print(f"⚠️ {account_name}: Could not parse remaining draws, trying once")
-                            remaining = 1
-                        break
+                remaining_str = find_action_line(response_text)
+                if remaining_str is not None:
+                    try:
+                        remaining = int(remaining_str)
+                        print(f"ℹ️ {account_name}: Remaining draws: {remaining}")
+                    except ValueError:
+                        # 不是数字，可能是其他格式
+                        print(f"⚠️ {account_name}: Could not parse remaining draws, trying once")
+                        remaining = 1
             else:
                 print(f"⚠️ {account_name}: Failed to check luckydraw status, HTTP {status_response.status_code}")
+                if is_cf_challenge_response(status_response):
+                    invalidate_cf_clearance_cache(
+                        "https://tw.b4u.qzz.io/luckydraw", account_name, account_index, proxy_config
+                    )
                 # 即使状态检查失败，也尝试抽奖一次
                 remaining = 1
 
@@ -513,9 +542,11 @@ async def get_b4u_cdk(
                 return
 
             # ===== 第二步：循环执行抽奖直到次数用完 =====
-            draw_headers = headers.copy()
-            draw_headers["next-action"] = "cfc5966b4123c674815ce067b6b8894545c15604"
-            draw_headers["next-router-state-tree"] = next_router_state_tree
+            draw_headers = {
+                **headers,
+                "next-action": B4U_DRAW_ACTION,
+                "next-router-state-tree": B4U_NEXT_ROUTER_STATE_TREE,
+            }
 
             draw_count = 0
             while remaining > 0:
@@ -528,7 +559,8 @@ async def get_b4u_cdk(
 
                 if response.status_code == 200:
                     response_text = response.text
-                    print(f"ℹ️ {account_name}: Luckydraw response #{draw_count + 1}: {response_text[:300]}")
+                    if is_debug():
+                        print(f"ℹ️ {account_name}: Luckydraw response #{draw_count + 1}: {response_text[:300]}")
 
                     # 解析响应，格式如:
                     # 0:["$@1",["xxx",null]]
@@ -536,54 +568,55 @@ async def get_b4u_cdk(
 
                     # 尝试从响应中提取 JSON 部分
                     # 查找以 "1:" 开头的行
-                    lines = response_text.strip().split("\n")
-                    for line in lines:
-                        if line.startswith("1:"):
-                            json_str = line[2:]  # 去掉 "1:" 前缀
+                    json_str = find_action_line(response_text)
+                    json_data = None
+                    parsed = False
+                    if json_str is not None:
+                        try:
+                            json_data = json.loads(json_str)
+                            parsed = True
+                        except json.JSONDecodeError:
+                            # 如果不是 JSON，可能是数字（如 "1:0" 表示已抽完）
                             try:
-                                json_data = json.loads(json_str)
-                                if isinstance(json_data, dict):
-                                    if json_data.get("success"):
-                                        redemption_code = json_data.get("redemptionCode", "")
-                                        prize = json_data.get("prize", {})
-                                        prize_name = prize.get("name", "Unknown")
-                                        message = json_data.get("message", "")
-
-                                        if redemption_code:
-                                            draw_count += 1
-                                            remaining -= 1
-                                            print(
-                                                f"✅ {account_name}: Luckydraw #{draw_count} successful! Prize: {prize_name}, Code: {redemption_code}, remaining: {remaining}"
-                                            )
-                                            yield True, {"code": redemption_code}
-                                        else:
-                                            print(
-                                                f"⚠️ {account_name}: Luckydraw successful but no redemption code: {message}"
-                                            )
-                                            remaining -= 1
-                                    else:
-                                        message = json_data.get("message", "Unknown error")
-                                        print(f"❌ {account_name}: Luckydraw failed - {message}")
-                                        yield False, {"error": f"Luckydraw failed - {message}"}
-                                        remaining = 0  # 失败时停止
-                                        break
-                            except json.JSONDecodeError:
-                                # 如果不是 JSON，可能是数字（如 "1:0" 表示已抽完）
-                                try:
-                                    new_remaining = int(json_str)
-                                    if new_remaining == 0:
-                                        print(f"ℹ️ {account_name}: No more draws remaining")
-                                        remaining = 0
-                                except ValueError:
-                                    pass
-                                continue
-                            break
-                    else:
+                                if int(json_str) == 0:
+                                    print(f"ℹ️ {account_name}: No more draws remaining")
+                            except ValueError:
+                                pass
+
+                    if not parsed:
                         # 如果没有找到有效的 JSON 响应
                         print(f"⚠️ {account_name}: Could not parse luckydraw response")
                         remaining = 0
+                    elif isinstance(json_data, dict):
+                        if json_data.get("success"):
+                            redemption_code = json_data.get("redemptionCode", "")
+                            prize = json_data.get("prize", {})
+                            prize_name = prize.get("name", "Unknown")
+                            message = json_data.get("message", "")
+
+                            if redemption_code:
+                                draw_count += 1
+                                remaining -= 1
+                                print(
+                                    f"✅ {account_name}: Luckydraw #{draw_count} successful! Prize: {prize_name}, Code: {redemption_code}, remaining: {remaining}"
+                                )
+                                yield True, {"code": redemption_code}
+                            else:
+                                print(
+                                    f"⚠️ {account_name}: Luckydraw successful but no redemption code: {message}"
+                                )
+                                remaining -= 1
+                        else:
+                            message = json_data.get("message", "Unknown error")
+                            print(f"❌ {account_name}: Luckydraw failed - {message}")
+                            yield False, {"error": f"Luckydraw failed - {message}"}
+                            remaining = 0  # 失败时停止
                 else:
                     print(f"❌ {account_name}: Luckydraw failed - HTTP {response.status_code}")
+                    if is_cf_challenge_response(response):
+                        invalidate_cf_clearance_cache(
+                            "https://tw.b4u.qzz.io/luckydraw", account_name, account_index, proxy_config
+                        )
                     yield False, {"error": f"Luckydraw failed - HTTP {response.status_code}"}
                     remaining = 0
 
@@ -7,11 +7,99 @@ Cloudflare cf_clearance cookie 获取模块
 
 from __future__ import annotations
 
-import tempfile
+import asyncio
+import json
+import time
 from camoufox.async_api import AsyncCamoufox
 from playwright_captcha import CaptchaType, ClickSolver, FrameworkType
+from utils.browser_utils import is_cloudflare_challenge, is_debug
 from utils.get_headers import get_browser_headers, print_browser_headers
 
+# 需要保留的 Cloudflare cookies
+CF_COOKIE_NAMES = frozenset({"cf_clearance", "__cf_bm", "cf_chl_2", "cf_chl_prog"})
+
+# cf_clearance 缓存有效期（秒），低于 Cloudflare 默认的 30 分钟
+CF_CLEARANCE_CACHE_TTL = 25 * 60
+
+# (账号索引, url, 代理配置) -> (获取时间, cf_cookies, browser_headers)
+cf_clearance_cache: dict[tuple[int, str, str], tuple[float, dict, dict | None]] = {}
+# 每个缓存 key 一把锁，避免同一账号并发获取时重复启动浏览器
+cf_clearance_locks: dict[tuple[int, str, str], asyncio.Lock] = {}
+
+
+def cf_clearance_cache_key(url: str, account_index: int, proxy_config: dict | None = None) -> tuple[int, str, str]:
+    """生成 cf_clearance 缓存 key
+
+    Args:
+        url: 目标 URL
+        account_index: 账号在 ACCOUNTS 中的索引，账号名称可能重复，不能用于区分账号
+        proxy_config: 代理配置
+
+    Returns:
+        tuple: (账号索引, url, 代理配置 JSON)
+    """
+    return account_index, url, json.dumps(proxy_config, sort_keys=True) if proxy_config else ""
+
+
+def invalidate_cf_clearance_cache(
+    url: str,
+    account_name: str,
+    account_index: int | None,
+    proxy_config: dict | None = None,
+) -> None:
+    """丢弃指定账号缓存的 cf_clearance，在被 Cloudflare 拒绝（403 或验证页面）时调用
+
+    Args:
+        url: 目标 URL
+        account_name: 账号名称，用于日志输出
+        account_index: 账号索引，为 None 时没有缓存，直接返回
+        proxy_config: 代理配置
+    """
+    if account_index is None:
+        return
+    if cf_clearance_cache.pop(cf_clearance_cache_key(url, account_index, proxy_config), None):
+        print(f"ℹ️ {account_name}: Dropped cached cf_clearance for {url}")
+
+
+async def get_cf_clearance_cached(
+    url: str,
+    account_name: str,
+    account_index: int | None,
+    proxy_config: dict | None = None,
+) -> tuple[dict | None, dict | None]:
+    """获取指定 URL 的 cf_clearance cookie，同一进程内按账号索引、URL 和代理复用
+
+    缓存只在同一账号内复用，不同账号之间共享 cf_clearance 和浏览器指纹会让远端关联这些账号；
+    没有账号索引（无法唯一区分账号）时不使用缓存
+
+    Args:
+        url: 目标 URL，需要获取 cf_clearance 的页面地址
+        account_name: 账号名称，用于日志输出
+        account_index: 账号在 ACCOUNTS 中的索引，为 None 时每次重新获取
+        proxy_config: 代理配置
+
+    Returns:
+        tuple: (cf_cookies, browser_headers)，格式同 get_cf_clearance
+    """
+    if account_index is None:
+        return await get_cf_clearance(url, account_name, proxy_config)
+
+    key = cf_clearance_cache_key(url, account_index, proxy_config)
+    lock = cf_clearance_locks.setdefault(key, asyncio.Lock())
+
+    async with lock:
+        cached = cf_clearance_cache.get(key)
+        if cached and time.monotonic() - cached[0] < CF_CLEARANCE_CACHE_TTL:
+            print(f"ℹ️ {account_name}: Reusing cached cf_clearance for {url}")
+            _, cf_cookies, browser_headers = cached
+            return dict(cf_cookies), dict(browser_headers) if browser_headers else browser_headers
+
+        cf_cookies, browser_headers = await get_cf_clearance(url, account_name, proxy_config)
+        if cf_cookies and "cf_clearance" in cf_cookies:
+            cf_clearance_cache[key] = (time.monotonic(), dict(cf_cookies), browser_headers)
+        return cf_cookies, browser_headers
+
+
 async def get_cf_clearance(
     url: str,
     account_name: str,
@@ -37,104 +125,100 @@ async def get_cf_clearance(
     Raises:
         Exception: 当自动验证失败或无法获取 cf_clearance 时抛出异常
     """
-
-    
-    safe_account_name = "".join(c if c.isalnum() else "_" for c in account_name)
-    
     print(
         f"ℹ️ {account_name}: Starting browser to get cf_clearance for {url} "
         f"(using proxy: {'true' if proxy_config else 'false'})"
     )
-    
-    with tempfile.TemporaryDirectory(prefix=f"camoufox_{safe_account_name}_cf_clearance_") as tmp_dir:
-        print(f"ℹ️ {account_name}: Using temporary directory: {tmp_dir}")
-        
-        async with AsyncCamoufox(
-            persistent_context=True,
-            user_data_dir=tmp_dir,
-            headless=False,
-            humanize=True,
-            locale="en-US",
-            geoip=True if proxy_config else False,
-            proxy=proxy_config,
-            os="macos",
-            config={
-                "forceScopeAccess": True,
-            }
-        ) as browser:
-            page = await browser.new_page()
-            
-            try:
-                print(f"ℹ️ {account_name}: Access {url} to trigger Cloudflare challenge")
-                
-                async with ClickSolver(
-                    framework=FrameworkType.CAMOUFOX,
-                    page=page,
-                    max_attempts=5,
-                    attempt_delay=3
-                ) as solver:
-                    await page.goto(url, wait_until="networkidle")
-                    await page.wait_for_timeout(5000)
-                    
-                    # 检查是否在 Cloudflare 验证页面
-                    page_title = await page.title()
-                    page_content = await page.content()
-                    
-                    if "Just a moment" in page_title or "Checking your browser" in page_content:
-                        print(f"ℹ️ {account_name}: Cloudflare challenge detected, auto-solving...")
-                        try:
-                            await solver.solve_captcha(
-                                captcha_container=page,
-                                captcha_type=CaptchaType.CLOUDFLARE_INTERSTITIAL
-                            )
-                            print(f"✅ {account_name}: Cloudflare challenge auto-solved")
-                            await page.wait_for_timeout(10000)
-                        except Exception as solve_err:
-                            print(f"⚠️ {account_name}: Auto-solve failed: {solve_err}, waiting for manual verification...")
-                            # 自动求解失败，回退到手动等待
-                            await wait_for_cf_clearance_manually(browser, page, account_name)
-                    else:
-                        print(f"ℹ️ {account_name}: No Cloudflare challenge detected")
-                        # 不需要手动操作，但需要等待后台完成 Cloudflare 验证
-                        await wait_for_cf_clearance_manually(browser, page, account_name)
-                
-                # 获取所有 cookies
-                cookies = await browser.cookies()
-                
-                cf_cookies = {}
-                for cookie in cookies:
-                    cookie_name = cookie.get("name")
-                    cookie_value = cookie.get("value")
+
+    # 只需要最终的 cookies，无需持久化 profile，使用非持久化 context 减少浏览器启动开销
+    async with AsyncCamoufox(
+        headless=False,
+        humanize=True,
+        locale="en-US",
+        geoip=True if proxy_config else False,
+        proxy=proxy_config,
+        os="macos",
+        config={
+            "forceScopeAccess": True,
+        }
+    ) as browser:
+        context = await browser.new_context()
+        page = await context.new_page()
+
+        try:
+            print(f"ℹ️ {account_name}: Access {url} to trigger Cloudflare challenge")
+
+            async with ClickSolver(
+                framework=FrameworkType.CAMOUFOX,
+                page=page,
+                max_attempts=5,
+                attempt_delay=3
+            ) as solver:
+                await page.goto(url, wait_until="networkidle")
+                await page.wait_for_timeout(5000)
+
+                # 检查是否在 Cloudflare 验证页面
+                if await is_cloudflare_challenge(page):
+                    print(f"ℹ️ {account_name}: Cloudflare challenge detected, auto-solving...")
+                    try:
+                        await solver.solve_captcha(
+                            captcha_container=page,
+                            captcha_type=CaptchaType.CLOUDFLARE_INTERSTITIAL
+                        )
+                        print(f"✅ {account_name}: Cloudflare challenge auto-solved")
+                        # 等待 cf_clearance 写入，获取到后立即继续，最多等待 10 秒
+                        await wait_for_cf_clearance_manually(
+                            context, page, account_name, max_wait_time=10000, check_interval=1000
+                        )
+                    except Exception as solve_err:
+                        print(f"⚠️ {account_name}: Auto-solve failed: {solve_err}, waiting for manual verification...")
+                        # 自动求解失败，回退到手动等待
+                        await wait_for_cf_clearance_manually(context, page, account_name)
+                else:
+                    print(f"ℹ️ {account_name}: No Cloudflare challenge detected")
+                    # 不需要手动操作，但需要等待后台完成 Cloudflare 验证
+                    await wait_for_cf_clearance_manually(context, page, account_name)
+
+            # 只获取目标 URL 对应的 cookies
+            cookies = await context.cookies(url)
+
+            debug = is_debug()
+            cf_cookies = {}
+            for cookie in cookies:
+                cookie_name = cookie.get("name")
+                cookie_value = cookie.get("value")
+                if debug:
                     print(f"  📚 Cookie: {cookie_name} (value: {cookie_value[:50] if cookie_value and len(cookie_value) > 50 else cookie_value}...)")
-                    if cookie_name in ["cf_clearance", "__cf_bm", "cf_chl_2", "cf_chl_prog"] and cookie_value is not None:
-                        cf_cookies[cookie_name] = cookie_value
-                
-                print(f"ℹ️ {account_name}: Got {len(cf_cookies)} Cloudflare cookies")
-                
-                # 获取浏览器指纹信息
-                browser_headers = await get_browser_headers(page)
-                print_browser_headers(account_name, browser_headers)
-                
-                # 检查是否获取到 cf_clearance cookie
-                if "cf_clearance" not in cf_cookies:
-                    print(f"⚠️ {account_name}: cf_clearance cookie not obtained")
-                    return None, browser_headers
-                
-                cookie_names = list(cf_cookies.keys())
-                print(f"✅ {account_name}: Successfully got Cloudflare cookies: {cookie_names}")
-                
-                return cf_cookies, browser_headers
-                
-            except Exception as e:
-                print(f"⚠️ {account_name}: Error getting cf_clearance: {e}")
-                return None, None
-            
-            finally:
-                await page.close()
+                if cookie_name in CF_COOKIE_NAMES and cookie_value is not None:
+                    cf_cookies[cookie_name] = cookie_value
+
+            print(f"ℹ️ {account_name}: Got {len(cf_cookies)} Cloudflare cookies")
+
+            # 获取浏览器指纹信息
+            browser_headers = await get_browser_headers(page)
+            print_browser_headers(account_name, browser_headers)
+
+            # 检查是否获取到 cf_clearance cookie
+            if "cf_clearance" not in cf_cookies:
+                print(f"⚠️ {account_name}: cf_clearance cookie not obtained")
+                return None, browser_headers
+
+            cookie_names = list(cf_cookies.keys())
+            print(f"✅ {account_name}: Successfully got Cloudflare cookies: {cookie_names}")
+
+            return cf_cookies, browser_headers
+
+        except Exception as e:
+            print(f"⚠️ {account_name}: Error getting cf_clearance: {e}")
+            return None, None
+
+        finally:
+            await page.close()
+            await context.close()
 
 
 async def wait_for_cf_clearance_manually(
-    browser,
+    context,
     page,
     account_name: str,
     max_wait_time: int = 60000,
@@ -145,7 +229,7 @@ async def wait_for_cf_clearance_manually(
     轮询检查 cf_clearance cookie 是否已获取，用于自动验证失败后的手动验证场景。
     
     Args:
-        browser: Camoufox 浏览器实例
+        context: Camoufox 浏览器 context
         page: 页面实例
         account_name: 账号名称，用于日志输出
         max_wait_time: 最大等待时间（毫秒），默认 60000（60 秒）
@@ -157,8 +241,8 @@ async def wait_for_cf_clearance_manually(
     elapsed_time = 0
 
     while elapsed_time < max_wait_time:
-        # 检查是否已经获取到 cf_clearance cookie
-        cookies = await browser.cookies()
+        # 检查是否已经获取到 cf_clearance cookie，只取当前页面 URL 对应的 cookies
+        cookies = await context.cookies(page.url)
         cf_clearance = None
         for cookie in cookies:
             if cookie.get("name") == "cf_clearance":
@@ -170,10 +254,7 @@ async def wait_for_cf_clearance_manually(
             return True
 
         # 检查页面是否还在 Cloudflare 验证页面
-        page_title = await page.title()
-        page_content = await page.content()
-        
-        if "Just a moment" in page_title or "Checking your browser" in page_content:
+        if await is_cloudflare_challenge(page):
             print(f"ℹ️ {account_name}: Cloudflare challenge in progress, waiting...")
         else:
             # 页面已经加载完成，但可能还没有 cf_clearance
@@ -12,6 +12,7 @@ from typing import TYPE_CHECKING
 
 from curl_cffi import requests as curl_requests
 
+from utils.get_headers import get_curl_cffi_impersonate
 from utils.http_utils import proxy_resolve, response_resolve
 
 if TYPE_CHECKING:
@@ -24,7 +25,7 @@ def get_newapi_check_in_status(
     cookies: dict,
     headers: dict,
     path: str = "/api/user/checkin",
-    impersonate: str = "firefox135",
+    impersonate: str | None = None,
 ) -> bool:
     """
     查询标准 newapi 签到状态，自动拼接当前月份
@@ -35,7 +36,7 @@ def get_newapi_check_in_status(
         cookies: cookies 字典
         headers: 请求头字典
         path: 签到状态接口路径，默认为 "/api/user/checkin"
-        impersonate: curl_cffi 浏览器指纹模拟，默认为 "firefox135"
+        impersonate: curl_cffi 浏览器指纹模拟，默认根据请求头中的 User-Agent 推断
 
     Returns:
         bool: 今日是否已签到
@@ -50,6 +51,10 @@ def get_newapi_check_in_status(
 
     print(f"🔍 {account_name}: Getting check-in status")
 
+    # TLS 指纹需与 User-Agent 保持一致
+    if not impersonate:
+        impersonate = get_curl_cffi_impersonate(headers.get("User-Agent", ""))
+
     try:
         session = curl_requests.Session(impersonate=impersonate, proxy=http_proxy, timeout=30)
         try:
@@ -100,7 +105,7 @@ def get_newapi_check_in_status(
 
 def create_newapi_check_in_status(
     path: str = "/api/user/checkin",
-    impersonate: str = "firefox135",
+    impersonate: str | None = None,
 ):
     """
     创建一个标准 newapi 签到状态查询函数
@@ -109,7 +114,7 @@ def create_newapi_check_in_status(
 
     Args:
         path: 签到状态接口路径，默认为 "/api/user/checkin"
-        impersonate: curl_cffi 浏览器指纹模拟，默认为 "firefox135"
+        impersonate: curl_cffi 浏览器指纹模拟，默认根据请求头中的 User-Agent 推断
 
     Returns:
         Callable: 签到状态查询函数，签名为 (provider_config, account_config, cookies, headers) -> bool
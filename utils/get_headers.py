@@ -5,8 +5,10 @@
 """
 
 import re
+from functools import lru_cache
 
 
+@lru_cache(maxsize=256)
 def get_curl_cffi_impersonate(user_agent: str) -> str:
     """根据 User-Agent 获取 curl_cffi 的 impersonate 值
     
@@ -16,6 +18,8 @@ def get_curl_cffi_impersonate(user_agent: str) -> str:
     - Safari: safari153-safari2601
     - Edge: edge99, edge101
     
+    纯函数，结果按 User-Agent 缓存，同一浏览器指纹只解析一次
+
     Args:
         user_agent: 浏览器 User-Agent 字符串
         
@@ -10,6 +10,8 @@ from urllib.parse import urlparse, urlunparse
 
 from curl_cffi import requests as curl_requests
 
+from utils.browser_utils import ensure_dir, sanitize_filename
+
 
 def proxy_resolve(proxy_config: dict | None = None) -> str | None:
     """将 proxy_config 转换为代理 URL 字符串
@@ -42,6 +44,18 @@ def proxy_resolve(proxy_config: dict | None = None) -> str | None:
     return proxy_url
 
 
+def is_cf_challenge_response(response: curl_requests.Response) -> bool:
+    """检查响应是否被 Cloudflare 拦截（403 或验证页面）
+
+    Args:
+        response: curl_cffi Response 对象
+
+    Returns:
+        是否被 Cloudflare 拦截
+    """
+    return response.status_code == 403 or response.headers.get("cf-mitigated", "").lower() == "challenge"
+
+
 def response_resolve(
     response: curl_requests.Response,
     context: str,
@@ -57,18 +71,18 @@ def response_resolve(
     Returns:
         JSON 数据字典，如果响应是 HTML 则返回 None
     """
-    safe_account_name = "".join(c if c.isalnum() else "_" for c in account_name)
-
-    logs_dir = "logs"
-    os.makedirs(logs_dir, exist_ok=True)
-
     try:
         return response.json()
     except json.JSONDecodeError as e:
         print(f"❌ {account_name}: Failed to parse JSON response: {e}")
 
+        # 只有需要保存响应内容时才创建日志目录
+        logs_dir = "logs"
+        ensure_dir(logs_dir)
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_context = "".join(c if c.isalnum() else "_" for c in context)
+        safe_account_name = sanitize_filename(account_name)
+        safe_context = sanitize_filename(context)
 
         content_type = response.headers.get("content-type", "").lower()
 
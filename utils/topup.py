@@ -5,15 +5,27 @@ Topup 工具函数 - 简单封装充值功能
 
 from __future__ import annotations
 
+import re
 from typing import TYPE_CHECKING
 
 from curl_cffi import requests as curl_requests
 
+from utils.get_headers import get_curl_cffi_impersonate
 from utils.http_utils import proxy_resolve, response_resolve
 
 if TYPE_CHECKING:
     from utils.config import AccountConfig, ProviderConfig
 
+# topup 请求在公共请求头基础上追加的头部
+TOPUP_EXTRA_HEADERS = {
+    "Content-Type": "application/json",
+    "Cache-Control": "no-store",
+    "Pragma": "no-cache",
+}
+
+# 兑换码已被使用的错误提示
+ALREADY_USED_PATTERN = re.compile(r"已被使用|已使用|already", re.IGNORECASE)
+
 
 def topup(
     provider_config: "ProviderConfig",
@@ -21,7 +33,8 @@ def topup(
     headers: dict,
     cookies: dict,
     key: str,
-    impersonate: str = "firefox135",
+    impersonate: str | None = None,
+    session: curl_requests.Session | None = None,
 ) -> dict:
     """执行充值请求
 
@@ -31,7 +44,8 @@ def topup(
         headers: 请求头
         cookies: cookies 字典
         key: 充值密钥
-        impersonate: curl_cffi 浏览器指纹模拟，默认为 "firefox135"
+        impersonate: curl_cffi 浏览器指纹模拟，仅在未传入 session 时使用，默认根据请求头中的 User-Agent 推断
+        session: 复用的 curl_cffi Session（可选），传入时沿用其连接和指纹，由调用方负责关闭
 
     Returns:
         包含 success 和 message 或 error 的字典
@@ -50,18 +64,19 @@ def topup(
             "error": "No topup URL configured",
         }
     
-    session = curl_requests.Session(impersonate=impersonate, proxy=http_proxy, timeout=30)
+    # 未传入 session 时创建临时 session，用完关闭；传入的 session 沿用调用方的指纹
+    own_session = session is None
+    if own_session:
+        # TLS 指纹需与 User-Agent 保持一致
+        if not impersonate:
+            impersonate = get_curl_cffi_impersonate(headers.get("User-Agent", ""))
+        session = curl_requests.Session(impersonate=impersonate, proxy=http_proxy, timeout=30)
     try:
         # 设置 cookies
         session.cookies.update(cookies)
 
         # 构建 topup 请求头
-        topup_headers = headers.copy()
-        topup_headers.update({
-            "Content-Type": "application/json",
-            "Cache-Control": "no-store",
-            "Pragma": "no-cache",
-        })
+        topup_headers = {**headers, **TOPUP_EXTRA_HEADERS}
 
         response = session.post(
             topup_url,
@@ -90,7 +105,7 @@ def topup(
             else:
                 error_msg = json_data.get("message", "Unknown error")
                 # 检查是否是已使用的情况
-                if "已被使用" in error_msg or "already" in error_msg.lower() or "已使用" in error_msg:
+                if ALREADY_USED_PATTERN.search(error_msg):
                     print(f"✅ {account_name}: Code already used - {error_msg}")
                     return {
                         "success": True,
@@ -115,4 +130,5 @@ def topup(
             "error": f"Topup failed: {e}(key: {key})",
         }
     finally:
-        session.close()
\ No newline at end of file
+        if own_session:
+            session.close()
\ No newline at end of file
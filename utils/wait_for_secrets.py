@@ -5,22 +5,63 @@ Based on https://github.com/step-security/wait-for-secrets
 """
 
 import os
+import random
 import time
 from typing import Optional
 
 from curl_cffi import requests as curl_requests
 
+# Reuse a fetched OIDC token for this many seconds (tokens stay valid for ~5 minutes)
+OIDC_TOKEN_REFRESH_SECONDS = 120
+
+# Polling backoff: start delay, growth factor and cap (seconds)
+POLL_INITIAL_DELAY = 2.0
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_DELAY = 10.0
+
+# Minimum interval between repeated secret URL reminders (seconds)
+URL_REMINDER_INTERVAL = 30
+
+# Give up polling after this many consecutive 5xx responses
+MAX_CONSECUTIVE_SERVER_ERRORS = 3
+
 
 class WaitForSecrets:
 
-    def get_oidc_token(self) -> Optional[str]:
+    def __init__(self):
+        self._oidc_token: Optional[str] = None
+        self._oidc_token_fetched_at = 0.0
+        self._auth_headers: Optional[dict] = None
+        # GitHub Actions environment does not change during a run, read it once
+        self._oidc_request_token = os.getenv("ACTIONS_ID_TOKEN_REQUEST_TOKEN")
+        self._oidc_request_url = os.getenv("ACTIONS_ID_TOKEN_REQUEST_URL")
+        self._oidc_audience_url = (
+            f"{self._oidc_request_url}&audience=api://ActionsOIDCGateway/Certify" if self._oidc_request_url else None
+        )
+        self._repository = os.getenv("GITHUB_REPOSITORY")
+        self._run_id = os.getenv("GITHUB_RUN_ID")
+
+    def get_oidc_token(self, session: Optional[curl_requests.Session] = None, force_refresh: bool = False) -> Optional[str]:
         """Get OIDC token from GitHub Actions environment
 
+        The token is cached and only re-requested once it is older than OIDC_TOKEN_REFRESH_SECONDS.
+
+        Args:
+                session: Optional curl_cffi Session to reuse connections
+                force_refresh: Ignore the cached token and request a new one
+
         Returns:
                 OIDC token string or None if not in GitHub Actions environment
         """
-        request_token = os.getenv("ACTIONS_ID_TOKEN_REQUEST_TOKEN")
-        request_url = os.getenv("ACTIONS_ID_TOKEN_REQUEST_URL")
+        if (
+            not force_refresh
+            and self._oidc_token
+            and time.monotonic() - self._oidc_token_fetched_at < OIDC_TOKEN_REFRESH_SECONDS
+        ):
+            return self._oidc_token
+
+        request_token = self._oidc_request_token
+        request_url = self._oidc_request_url
 
         if not request_token or not request_url:
             print("⚠️ Not running in GitHub Actions environment (OIDC tokens not available)")
@@ -34,13 +75,19 @@ class WaitForSecrets:
                 "Content-Type": "application/json",
             }
 
-            audience_url = f"{request_url}&audience=api://ActionsOIDCGateway/Certify"
-            response = curl_requests.get(audience_url, headers=headers, timeout=30)
+            audience_url = self._oidc_audience_url
+            if session:
+                response = session.get(audience_url, headers=headers, timeout=30)
+            else:
+                response = curl_requests.get(audience_url, headers=headers, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
                 token = data.get("value")
                 if token:
+                    self._oidc_token = token
+                    self._oidc_token_fetched_at = time.monotonic()
+                    self._auth_headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
                     return token
                 print("❌ OIDC token not found in response")
                 return None
@@ -51,14 +98,29 @@ class WaitForSecrets:
             print(f"❌ Error getting OIDC token: {e}")
             return None
 
+    def get_auth_headers(self, session: Optional[curl_requests.Session] = None) -> Optional[dict]:
+        """Get StepSecurity API headers for the current OIDC token
+
+        The headers dict is built once per token and reused until the token is refreshed.
+
+        Args:
+                session: Optional curl_cffi Session to reuse connections
+
+        Returns:
+                Headers dict or None if no OIDC token is available
+        """
+        if not self.get_oidc_token(session):
+            return None
+        return self._auth_headers
+
     def parse_data_from_environment(self) -> Optional[list[str]]:
         """Parse repository data from GitHub Actions environment variables
 
         Returns:
                 List containing [owner, repo, run_id] or None if environment variables not set
         """
-        repository = os.getenv("GITHUB_REPOSITORY")
-        run_id = os.getenv("GITHUB_RUN_ID")
+        repository = self._repository
+        run_id = self._run_id
 
         if not repository or not run_id:
             print("⚠️ Not running in GitHub Actions environment")
@@ -86,17 +148,26 @@ class WaitForSecrets:
         secret_url = f"https://app.stepsecurity.io/secrets/{owner}/{repo}/{run_id}"
         return secret_url
 
-    def get(self, secrets_metadata: dict, timeout: int = 5, notification: dict = {}) -> Optional[dict]:
+    def get(
+        self,
+        secrets_metadata: dict[str, dict[str, str]],
+        timeout: int = 5,
+        notification: Optional[dict] = None,
+    ) -> Optional[dict]:
         """Register, poll and clear secrets from StepSecurity API
 
         Args:
                 token: OIDC token from GitHub Actions
                 secrets_metadata: Dictionary of secrets with format {name: {name: str, description: str}}
                 timeout: Maximum time to wait in minutes (default: 5)
+                notification: Optional notification with "title" and "content" keys
 
         Returns:
                 Secret values or None if timeout/error
         """
+        notification = notification or {}
+        # Reuse one session so polling keeps the connections alive instead of re-handshaking every request
+        session = curl_requests.Session()
         try:
             # Parse environment data
             environment_data = self.parse_data_from_environment()
@@ -109,13 +180,12 @@ class WaitForSecrets:
             secret_url = self.generate_secret_url(owner, repo, run_id)
 
             # Get OIDC token
-            token = self.get_oidc_token()
-            if not token:
+            headers = self.get_auth_headers(session)
+            if not headers:
                 return None
 
             # Use the correct API endpoint as per reference implementation
             api_url = "https://prod.api.stepsecurity.io/v1/secrets"
-            headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
 
             # Convert secrets_metadata to expected payload format
             secrets_metadata_payload = []
@@ -125,7 +195,7 @@ class WaitForSecrets:
                 secrets_metadata_payload.append(f"description: {secret_info.get('description', '')}")
 
             # Step 1: Send PUT request to register secrets
-            put_response = curl_requests.put(api_url, headers=headers, json=secrets_metadata_payload, timeout=30)
+            put_response = session.put(api_url, headers=headers, json=secrets_metadata_payload, timeout=30)
 
             if put_response.status_code != 200:
                 print(f"❌ Failed to register secret request: HTTP {put_response.status_code}, {put_response.text}")
@@ -148,15 +218,18 @@ class WaitForSecrets:
                 print(f"⚠️ Failed to send notification: {e}")
 
             # Step 2: Poll for secrets
-            start_time = time.time()
+            start_time = time.monotonic()
             timeout_in_seconds = timeout * 60  # Convert minutes to seconds
             secrets_data = None
+            poll_delay = POLL_INITIAL_DELAY
+            consecutive_server_errors = 0
 
             print(f"⏳ Polling for secrets (timeout: {timeout} minute(s))...")
             print(f"  🔗 Visit this URL to input secrets: {secret_url}")
+            last_url_reminder = time.monotonic()
 
             while True:
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
 
                 if elapsed >= timeout_in_seconds:
                     print(f"⏱️ Timeout after {timeout} minute(s) waiting for secrets")
@@ -165,15 +238,14 @@ class WaitForSecrets:
 
                 try:
                     # Get OIDC token
-                    token = self.get_oidc_token()
-                    if not token:
+                    headers = self.get_auth_headers(session)
+                    if not headers:
                         break
 
-                    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-
-                    get_response = curl_requests.get(api_url, headers=headers, timeout=30)
+                    get_response = session.get(api_url, headers=headers, timeout=30)
 
                     if get_response.status_code == 200:
+                        consecutive_server_errors = 0
                         data = get_response.json()
                         # Check if secrets are set (as per reference implementation)
                         are_secrets_set = data.get("areSecretsSet", False)
@@ -193,9 +265,19 @@ class WaitForSecrets:
                                 print(f"✅ Secrets received: {secrets_data}")
                                 break
                         else:
-                            print(f"  🔗 Visit this URL to input secrets: {secret_url}")
-                            # Wait before next polling
-                            time.sleep(9)
+                            # Remind the URL at most once per interval instead of every poll
+                            if time.monotonic() - last_url_reminder >= URL_REMINDER_INTERVAL:
+                                print(f"  🔗 Visit this URL to input secrets: {secret_url}")
+                                last_url_reminder = time.monotonic()
+                    elif get_response.status_code >= 500:
+                        # Retry transient server errors instead of dropping the user's input
+                        consecutive_server_errors += 1
+                        print(
+                            f"⚠️ Server error while polling: HTTP {get_response.status_code} "
+                            f"({consecutive_server_errors}/{MAX_CONSECUTIVE_SERVER_ERRORS})"
+                        )
+                        if consecutive_server_errors >= MAX_CONSECUTIVE_SERVER_ERRORS:
+                            break
                     else:
                         # Check response body for specific error messages
                         try:
@@ -210,19 +292,19 @@ class WaitForSecrets:
                 except Exception as e:
                     print(f"⚠️ Polling error: {e}")
 
-                # Wait before next poll
-                time.sleep(1)
+                # Wait before next poll with exponential backoff and jitter, never past the timeout
+                remaining = timeout_in_seconds - (time.monotonic() - start_time)
+                time.sleep(max(0.0, min(poll_delay * random.uniform(0.8, 1.2), remaining)))
+                poll_delay = min(poll_delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY)
 
             # Step 3: Clear secrets from datastore
             try:
                 # Get OIDC token
-                token = self.get_oidc_token()
-                if not token:
+                headers = self.get_auth_headers(session)
+                if not headers:
                     raise Exception("Failed to get OIDC token for clearing secrets")
 
-                headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-
-                delete_response = curl_requests.delete(api_url, headers=headers, timeout=30)
+                delete_response = session.delete(api_url, headers=headers, timeout=30)
 
                 if delete_response.status_code == 200:
                     print("✅ Secret cleared from datastore")
@@ -237,3 +319,5 @@ class WaitForSecrets:
         except Exception as e:
             print(f"❌ Error in wait_for_secrets: {e}")
             return None
+        finally:
+            session.close()